@@ -0,0 +1,38 @@
+bl_info = {
+	"name": "AN7 Point Generator",
+	"author": "Iaian7 - John Einselen",
+	"version": (0, 7, 0),
+	"blender": (2, 92, 0),
+	"location": "Scene (object mode) > AN7 Tools > Point Generator",
+	"description": "Creates point arrays with vertex attribute data",
+	"warning": "inexperienced developer, use at your own risk",
+	"doc_url": "https://github.com/iaian7/AN7-BlenderPointGenerator",
+	"tracker_url": "https://github.com/iaian7/AN7-BlenderPointGenerator/issues",
+	"category": "3D View"}
+
+# Only the operators, interface, preview and collision modules import Blender, everything else can also be used headless
+try:
+	import bpy
+except ImportError:
+	bpy = None
+
+if bpy is not None:
+	from .operators import AN7_Point_Walk, AN7_Point_Walk_Modal, AN7_Point_Walk_Extend, AN7_Point_Grid, AN7_Point_Tri, AN7_Point_TriHex, AN7_Point_Hex, AN7_Point_Volume, AN7_Point_Poisson, AN7_Point_Preview, AN7_Point_Preview_Apply, AN7_Point_Cache_Export, AN7_Point_Cache_Import
+	from .interface import AN7PointGenPreferences, an7PointGenSettings, AN7TOOLS_PT_point_gen
+
+	classes = (AN7PointGenPreferences, AN7_Point_Walk, AN7_Point_Walk_Modal, AN7_Point_Walk_Extend, AN7_Point_Grid, AN7_Point_Tri, AN7_Point_TriHex, AN7_Point_Hex, AN7_Point_Volume, AN7_Point_Poisson, AN7_Point_Preview, AN7_Point_Preview_Apply, AN7_Point_Cache_Export, AN7_Point_Cache_Import, an7PointGenSettings, AN7TOOLS_PT_point_gen)
+
+###########################################################################
+# Addon registration functions
+
+def register():
+	for cls in classes:
+		bpy.utils.register_class(cls)
+	bpy.types.Scene.an7_point_gen_settings = bpy.props.PointerProperty(type=an7PointGenSettings)
+
+def unregister():
+	from . import preview
+	preview.stop()
+	for cls in reversed(classes):
+		bpy.utils.unregister_class(cls)
+	del bpy.types.Scene.an7_point_gen_settings
@@ -0,0 +1,164 @@
+###########################################################################
+# Benchmark harness
+#
+# Runs every generator over a fixed matrix of settings and seeds, timing the generation and the bulk write stages:
+#   python -m AN7_pointGen.benchmark --output results.json
+#   python -m AN7_pointGen.benchmark --output results.json --baseline previous.json
+# Headless, the write stage is a point cache file (the same bulk column writes as the mesh), inside Blender it's a temporary mesh:
+#   blender -b -P path/to/AN7_pointGen/benchmark.py -- --output results.json
+# With a baseline, any case slower than the threshold (and by more than the floor) is reported, and the exit code is 1 so scripts can catch the regression
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+if __name__ == "__main__" and not __package__:
+	# Run as a script file (blender -P), so make the add-on importable and run it as a package instead
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+	from AN7_pointGen import benchmark
+	sys.exit(benchmark.main())
+
+import numpy as np
+
+from .points import Settings, settings_dict
+from .generators import generate
+from . import pointcache
+
+try:
+	import bpy
+except ImportError:
+	bpy = None
+
+SEED = 1
+
+def cases():
+	# (name, settings) for every benchmarked configuration
+	matrix = []
+	for count in (8, 32):
+		for levels in (2, 4):
+			matrix.append(('GRID count=' + str(count) + ' levels=' + str(levels), Settings(gen_type='GRID', grid_count_X=count, grid_count_Y=count, division_levels=levels, seed=SEED)))
+			matrix.append(('TRI count=' + str(count) + ' levels=' + str(levels), Settings(gen_type='TRI', tri_count=count, division_levels=levels, seed=SEED)))
+	for count in (4, 16):
+		for levels in (2, 4):
+			matrix.append(('TRIHEX count=' + str(count) + ' levels=' + str(levels), Settings(gen_type='TRIHEX', hex_count=count, division_levels=levels, seed=SEED)))
+			matrix.append(('HEX count=' + str(count) + ' levels=' + str(levels), Settings(gen_type='HEX', hex_count=count, division_levels=levels, seed=SEED)))
+	for count in (4, 12):
+		for levels in (2, 3):
+			for kind in ('CUBE', 'FCC', 'BCC'):
+				matrix.append((kind + ' count=' + str(count) + ' levels=' + str(levels), Settings(gen_type=kind, grid_count_X=count, grid_count_Y=count, grid_count_Z=count, division_levels=levels, seed=SEED)))
+	for elements in (300, 3000):
+		matrix.append(('WALK elements=' + str(elements), Settings(gen_type='WALK', max_elements=elements, max_failures=10000, max_attempts=1000000, seed=SEED)))
+	for elements in (10000, 100000):
+		matrix.append(('POISSON elements=' + str(elements), Settings(gen_type='POISSON', max_elements=elements, seed=SEED)))
+	return matrix
+
+def measure(function, repeat):
+	# One run under tracemalloc for the peak memory (tracing slows everything down, so it also serves as the untimed warm-up), then the best wall time of several runs
+	tracemalloc.start()
+	function()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	seconds = None
+	for i in range(repeat):
+		timer = time.perf_counter()
+		result = function()
+		seconds = min(seconds, time.perf_counter() - timer) if seconds is not None else time.perf_counter() - timer
+	return result, seconds, peak
+
+def stage(count, seconds, peak):
+	return {'seconds': seconds, 'peak_bytes': peak, 'points_per_second': count / seconds if seconds > 0.0 else 0.0}
+
+def write_stage(points, directory):
+	# Bulk write of the generated columns: a temporary mesh inside Blender, a point cache file headless
+	if bpy is not None:
+		from .mesh_io import write_points
+		mesh = bpy.data.meshes.new("AN7 benchmark")
+		try:
+			write_points(mesh, points)
+		finally:
+			bpy.data.meshes.remove(mesh)
+	else:
+		pointcache.save_points(os.path.join(directory, 'benchmark.an7p'), points)
+
+def run(matrix, repeat):
+	results = []
+	with tempfile.TemporaryDirectory() as directory:
+		for name, settings in matrix:
+			points, seconds, peak = measure(lambda: generate(settings), repeat)
+			generation = stage(len(points), seconds, peak)
+			written, seconds, peak = measure(lambda: write_stage(points, directory), repeat)
+			results.append({
+				'name': name,
+				'type': settings.gen_type,
+				'seed': settings.seed,
+				'settings': settings_dict(settings),
+				'points': len(points),
+				'generate': generation,
+				'write': stage(len(points), seconds, peak),
+				})
+			print(name + ": " + str(len(points)) + " points, generate " + str(round(generation['seconds'], 4)) + "s (" + str(int(generation['points_per_second'])) + " per second), write " + str(round(results[-1]['write']['seconds'], 4)) + "s")
+	return results
+
+def compare(results, baseline, threshold, floor=0.005):
+	# Cases slower than the baseline by more than the threshold (as a fraction), matched by name
+	# Slowdowns smaller than the floor (in seconds) are timer noise on the fastest cases, however large they are as a fraction
+	previous = {}
+	for result in baseline['results']:
+		previous[result['name']] = result
+	regressions = []
+	for result in results:
+		old = previous.get(result['name'])
+		if old is None:
+			continue
+		if old['points'] != result['points']:
+			print(result['name'] + ": point count changed from " + str(old['points']) + " to " + str(result['points']))
+		for key in ('generate', 'write'):
+			ratio = result[key]['seconds'] / max(old[key]['seconds'], 1e-9)
+			if ratio > 1.0 + threshold and result[key]['seconds'] - old[key]['seconds'] > floor:
+				regressions.append((result['name'], key, ratio))
+				print("SLOWER " + result['name'] + " (" + key + "): " + str(round(old[key]['seconds'], 4)) + "s -> " + str(round(result[key]['seconds'], 4)) + "s, " + str(round(ratio, 2)) + "×")
+	return regressions
+
+def main(argv=None):
+	if argv is None:
+		argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:] # Blender keeps its own arguments in front of "--"
+	parser = argparse.ArgumentParser(prog="AN7_pointGen.benchmark", description="Benchmark the AN7 point generators")
+	parser.add_argument('--output', help="write the results to this JSON file")
+	parser.add_argument('--baseline', help="compare against the results JSON of an earlier run")
+	parser.add_argument('--threshold', type=float, default=0.2, help="slowdown reported as a regression (default: 0.2, meaning 20 percent)")
+	parser.add_argument('--floor', type=float, default=0.005, help="smallest slowdown in seconds reported as a regression (default: 0.005)")
+	parser.add_argument('--repeat', type=int, default=3, help="timed runs per case, the fastest one is kept (default: 3)")
+	parser.add_argument('--filter', default='', help="only run cases whose name contains this text")
+	args = parser.parse_args(argv)
+
+	matrix = [(name, settings) for name, settings in cases() if args.filter in name]
+	results = run(matrix, max(1, args.repeat))
+	report = {
+		'environment': {
+			'python': platform.python_version(),
+			'numpy': np.__version__,
+			'blender': bpy.app.version_string if bpy is not None else None,
+			'platform': platform.platform(),
+			'processor': platform.processor(),
+			'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+			},
+		'results': results,
+		}
+	if args.output:
+		with open(args.output, 'w') as file:
+			json.dump(report, file, indent=1)
+
+	if args.baseline:
+		with open(args.baseline, 'r') as file:
+			baseline = json.load(file)
+		if compare(results, baseline, args.threshold, args.floor):
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,152 @@
+###########################################################################
+# Command line batch generation
+#
+# Headless, writing each job's arrays to a point cache file (see pointcache.py) at its output path:
+#   python -m AN7_pointGen.cli jobs.json --workers 64
+# Inside Blender, importing jobs with a target object into the scene once every job has been generated:
+#   blender -b scene.blend -P path/to/AN7_pointGen/cli.py -- jobs.json --save
+#
+# A jobs file is a JSON list (or a TOML/JSON table with a "jobs" list, plus optional "defaults" settings shared by every job):
+#   {"defaults": {"division_levels": 3},
+#    "jobs": [{"type": "TRIHEX", "settings": {"hex_count": 6}, "seed": [1, 2, 3], "output": "trihex_{seed}.an7p"},
+#             {"type": "WALK", "settings": {"max_elements": 5000}, "seed": 7, "object": "Walk"}]}
+# A list of seeds expands into one job per seed, with {seed} replaced in the output path and object name
+# Lattices bigger than 5 million points (or a job's "stream" count) are streamed to their output file in chunks, keeping the memory use flat
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+if __name__ in ("__main__", "__mp_main__") and not __package__:
+	# Run as a script file (blender -P), so make the add-on importable and run it as a package instead
+	# Spawned workers run this file again as __mp_main__, where it only needs its own imports to work (the jobs run in AN7_pointGen.cli)
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+	if __name__ == "__main__":
+		from AN7_pointGen import cli
+		sys.exit(cli.main())
+	__package__ = "AN7_pointGen"
+
+from .points import Settings, settings_dict
+from .estimate import point_count
+from .generators import generate, stream_points
+from . import pointcache
+
+try:
+	import bpy
+except ImportError:
+	bpy = None
+
+STREAM = 5000000 # jobs with only an output file are streamed to it above this many points (a job's "stream" entry overrides it)
+
+def load_jobs(path):
+	# Read a JSON or TOML jobs file and expand it into a flat list of jobs
+	if path.lower().endswith('.toml'):
+		import tomllib # Python 3.11 or newer
+		with open(path, 'rb') as file:
+			data = tomllib.load(file)
+	else:
+		with open(path, 'r') as file:
+			data = json.load(file)
+
+	if isinstance(data, list):
+		data = {'jobs': data}
+	defaults = data.get('defaults', {})
+
+	jobs = []
+	for i, job in enumerate(data.get('jobs', [])):
+		if 'output' not in job and 'object' not in job:
+			raise ValueError("Job " + str(i) + " needs an output path or a target object")
+		settings = dict(defaults, **job.get('settings', {}))
+		seeds = job.get('seed', settings.get('seed', 0)) # settings copied from a point cache header carry their own seed
+		for seed in (seeds if isinstance(seeds, list) else [seeds]):
+			expanded = dict(job)
+			expanded['seed'] = seed
+			expanded['settings'] = settings
+			for key in ('output', 'object'):
+				if key in job:
+					expanded[key] = job[key].replace('{seed}', str(seed))
+			expanded.setdefault('name', expanded.get('object') or expanded.get('output'))
+			jobs.append(expanded)
+	return jobs
+
+def job_settings(job):
+	# The job's own type and seed take precedence over any in its settings (such as a full settings dict from a point cache header)
+	values = dict(job['settings'])
+	values['gen_type'] = job.get('type', values.get('gen_type', 'GRID'))
+	values['seed'] = job['seed']
+	return Settings(**values)
+
+def run_job(job):
+	# Runs in a worker process, so this never touches Blender
+	timer = time.time()
+	settings = job_settings(job)
+	header = {'type': settings.gen_type, 'seed': settings.seed, 'settings': settings_dict(settings)}
+	if 'output' in job:
+		directory = os.path.dirname(job['output'])
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+	if 'output' in job and 'object' not in job and point_count(settings) > job.get('stream', STREAM):
+		# Big arrays go straight to the file chunk by chunk, without ever being held in memory
+		count = stream_points(job['output'], settings, header)
+		return count, time.time() - timer, None
+	points = generate(settings)
+	seconds = time.time() - timer
+	if 'output' in job:
+		# Point cache file, with the type, settings and seed stored in its header so it can be regenerated
+		pointcache.save_points(job['output'], points, header)
+	# Only jobs targeting a Blender object send their arrays back to the main process
+	return len(points), seconds, points if 'object' in job else None
+
+def import_points(name, points):
+	# Write a result into the named mesh object, creating it in the active scene if needed
+	from .mesh_io import write_points
+	obj = bpy.data.objects.get(name)
+	if obj is None:
+		obj = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+		bpy.context.scene.collection.objects.link(obj)
+	write_points(obj.data, points)
+
+def main(argv=None):
+	if argv is None:
+		argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:] # Blender keeps its own arguments in front of "--"
+	parser = argparse.ArgumentParser(prog="AN7_pointGen.cli", description="Generate AN7 point arrays from a JSON or TOML jobs file")
+	parser.add_argument('jobs', help="JSON or TOML jobs file")
+	parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of worker processes (default: all cores)")
+	parser.add_argument('--save', action='store_true', help="save the .blend file after importing (Blender only)")
+	args = parser.parse_args(argv)
+
+	jobs = load_jobs(args.jobs)
+	if bpy is None and any('output' not in job for job in jobs):
+		parser.error("jobs with only a target object need Blender, give them an output path to run headless")
+
+	timer = time.time()
+	results = []
+	if args.workers > 1 and len(jobs) > 1:
+		# Spawned workers start from a clean interpreter, which is the only safe option inside Blender
+		with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+			for i, result in enumerate(executor.map(run_job, jobs, chunksize=max(1, len(jobs) // (args.workers * 4)))):
+				print("[" + str(i + 1) + "/" + str(len(jobs)) + "] " + jobs[i]['name'] + ": " + str(result[0]) + " points in " + str(round(result[1], 2)) + "s")
+				results.append(result)
+	else:
+		for i, job in enumerate(jobs):
+			result = run_job(job)
+			print("[" + str(i + 1) + "/" + str(len(jobs)) + "] " + job['name'] + ": " + str(result[0]) + " points in " + str(round(result[1], 2)) + "s")
+			results.append(result)
+
+	# One Blender import step at the end
+	if bpy is not None:
+		for job, result in zip(jobs, results):
+			if result[2] is not None:
+				import_points(job['object'], result[2])
+		if args.save:
+			bpy.ops.wm.save_mainfile()
+
+	print("Generated " + str(sum(result[0] for result in results)) + " points in " + str(len(jobs)) + " jobs, " + str(round(time.time() - timer, 2)) + "s")
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
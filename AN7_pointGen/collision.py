@@ -0,0 +1,44 @@
+###########################################################################
+# Scene geometry collision for the random walk
+# Uses mathutils (part of Blender), so unlike the generators this only works inside Blender
+
+import hashlib
+
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+from . import profiler
+
+class Collider:
+	# Rejects walk candidates (x, y, z, radius) that touch the surface of a mesh, or lie on the wrong side of it
+	# INSIDE keeps the walk within a closed mesh (a vessel), OUTSIDE keeps it out of one (an obstacle); the mesh normals need to point outwards
+	def __init__(self, tree, mode, key):
+		self.tree = tree
+		self.mode = mode
+		self.key = key
+
+	def rejects(self, point):
+		# A single nearest surface query answers both questions: closer than the radius means the sphere intersects the surface, otherwise the side of the surface it's on decides
+		center = Vector(point[:3])
+		location, normal, index, distance = self.tree.find_nearest(center)
+		if location is None:
+			return self.mode == 'INSIDE' # an empty mesh has no inside
+		if distance < point[3]:
+			return True
+		inside = (location - center).dot(normal) > 0.0
+		return inside != (self.mode == 'INSIDE')
+
+# BVH trees of the collision meshes used so far, by object name: (geometry key, tree)
+# Building a tree is the expensive part, so it's only rebuilt when the mesh (or its placement relative to the walk) changes
+TREES = {}
+
+def collider(name, vertices, triangles, mode):
+	# vertices (V×3) and triangles (T×3 vertex indices) of the collision mesh, in the space of the walk
+	key = hashlib.blake2b(vertices.tobytes() + triangles.tobytes(), digest_size=16).hexdigest()
+	entry = TREES.get(name)
+	if entry is None or entry[0] != key:
+		entry = TREES[name] = (key, BVHTree.FromPolygons(vertices.reshape(-1, 3).tolist(), triangles.reshape(-1, 3).tolist()))
+		profiler.lap("collision tree")
+	else:
+		profiler.count("collision tree reused")
+	return Collider(entry[1], mode, (mode, key))
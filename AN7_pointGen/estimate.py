@@ -0,0 +1,95 @@
+###########################################################################
+# Point count, memory and time estimates (no Blender imports)
+# Shared by the panel (which redraws constantly) and the generators (which use the exact counts to preallocate their output)
+
+import functools
+import math
+import os
+
+# Number of children each element divides into
+CHILDREN = {
+	'GRID': 4,
+	'TRI': 4,
+	'TRIHEX': 4,
+	'HEX': 3,
+	'CUBE': 8,
+	'FCC': 8,
+	'BCC': 8,
+	}
+
+# Rough throughput used for the time estimate (points per second for the lattices and the Poisson-disc fill, attempts per second for the walk)
+LATTICE_RATE = 1500000.0
+POISSON_RATE = 30000.0
+WALK_RATE = 150000.0
+
+# Peak bytes per point: the float32 subdivision buffer, the float32 output columns, and the mesh data in Blender
+BYTES_PER_POINT = 20 + 32 + 32
+# Streamed lattices only ever hold one chunk, so their peak is just the mesh data
+STREAMED_BYTES_PER_POINT = 32
+
+def split_count(count, percentage):
+	# Number of elements selected for division out of a shuffled level (ceil(count × percentage), matching the original index / count < percentage selection)
+	return min(count, max(0, int(math.ceil(percentage * count))))
+
+def base_count(settings):
+	# Number of elements in the undivided lattice
+	if settings.gen_type == 'GRID':
+		return settings.grid_count_X * settings.grid_count_Y
+	elif settings.gen_type == 'TRI':
+		return settings.tri_count ** 2
+	elif settings.gen_type == 'TRIHEX':
+		return 6 * (settings.hex_count ** 2)
+	elif settings.gen_type == 'HEX':
+		return 3 * (settings.hex_count ** 2) - 3 * settings.hex_count + 1
+	elif settings.gen_type in ('CUBE', 'FCC', 'BCC'):
+		return settings.grid_count_X * settings.grid_count_Y * settings.grid_count_Z * {'CUBE': 1, 'FCC': 4, 'BCC': 2}[settings.gen_type] # points per cubic cell
+	return 0
+
+@functools.lru_cache(maxsize=256)
+def division_counts(base, children, levels, percentage):
+	# Elements settled at each level (undivided elements of levels 0 to levels-1, then the whole last level)
+	# The split counts are deterministic, so this is exactly what the subdivision engine will produce
+	settled = []
+	level = base
+	for rec in range(levels):
+		split = split_count(level, percentage)
+		settled.append(level - split)
+		level = split * children
+	settled.append(level)
+	return tuple(settled)
+
+def point_count(settings):
+	# Exact number of points for the lattices, and the upper limit for the random walk
+	if settings.gen_type == 'WALK':
+		return settings.max_elements * settings.walk_chains
+	elif settings.gen_type == 'POISSON':
+		return settings.max_elements
+	return sum(division_counts(base_count(settings), CHILDREN[settings.gen_type], settings.division_levels, settings.division_percentage))
+
+def memory_estimate(settings, stream_threshold=0):
+	# Approximate peak memory in bytes (lattices above a non-zero streaming threshold are generated in chunks)
+	count = point_count(settings)
+	if settings.gen_type in CHILDREN and stream_threshold > 0 and count > stream_threshold:
+		return count * STREAMED_BYTES_PER_POINT
+	return count * BYTES_PER_POINT
+
+def time_estimate(settings):
+	# Approximate processing time in seconds (the walk's worst case is running out of attempts, with chains running one per core)
+	if settings.gen_type == 'WALK':
+		return settings.max_attempts / WALK_RATE * math.ceil(settings.walk_chains / float(os.cpu_count() or 1))
+	elif settings.gen_type == 'POISSON':
+		return settings.max_elements / POISSON_RATE
+	return point_count(settings) / LATTICE_RATE
+
+def format_bytes(size):
+	for unit in ('B', 'KB', 'MB', 'GB'):
+		if size < 1024.0 or unit == 'GB':
+			return str(round(size, 1)) + " " + unit
+		size /= 1024.0
+
+def format_seconds(seconds):
+	if seconds < 1.0:
+		return "under a second"
+	elif seconds < 120.0:
+		return str(int(round(seconds))) + " seconds"
+	return str(int(round(seconds / 60.0))) + " minutes"
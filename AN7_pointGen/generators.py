@@ -0,0 +1,44 @@
+###########################################################################
+# Generator lookup (no Blender imports)
+
+from . import pointcache
+from .estimate import point_count
+from .lattice import generate_grid, generate_tri, generate_trihex, generate_hex, generate_volume, generate_chunks, generate_streamed, CHUNK, DIVISIONS
+from .poisson import generate_poisson
+from .walk import generate_walk
+
+GENERATORS = {
+	'GRID': generate_grid,
+	'TRI': generate_tri,
+	'TRIHEX': generate_trihex,
+	'HEX': generate_hex,
+	'CUBE': generate_volume,
+	'FCC': generate_volume,
+	'BCC': generate_volume,
+	'POISSON': generate_poisson,
+	'WALK': generate_walk,
+	}
+
+def generate(settings, rng=None, mask=None):
+	# Returns a Points container for the array type selected in the settings, optionally limited to a region mask (see mask.py)
+	return GENERATORS[settings.gen_type](settings, rng, mask)
+
+def streams(settings, threshold, mask=None):
+	# Whether an array is written through stream_points with this streaming threshold (unmasked lattices with more points than the threshold, 0 never streams)
+	return mask is None and settings.gen_type in DIVISIONS and threshold > 0 and point_count(settings) > threshold
+
+def stream_points(path, settings, header=None, size=CHUNK):
+	# Generate straight into a point cache file, returning the number of points written
+	# The lattices are written chunk by chunk (the total is known exactly from the estimate), so the peak memory stays flat at one chunk however big the array is
+	# Streamed lattices are grouped by slice of the base lattice, so they differ from generate() for the same seed (see lattice.generate_chunks)
+	# The walk and the Poisson-disc fill are capped at max_elements, and are generated whole and then saved
+	header = dict(header or {}, chunk=size) # streamed arrays can only be regenerated with the same chunk size
+	if settings.gen_type not in DIVISIONS:
+		points = generate(settings)
+		pointcache.save_points(path, points, header)
+		return len(points)
+	count = point_count(settings)
+	with pointcache.CacheWriter(path, count, header, [('level', '<i4'), ('parent', '<i4')] if settings.hierarchy else ()) as writer:
+		for chunk in generate_chunks(settings, size):
+			writer.write(chunk)
+	return count
@@ -0,0 +1,619 @@
+import bpy
+
+from . import estimate
+from . import preview
+from . import profiler
+from .operators import AN7_Point_Walk, AN7_Point_Walk_Modal, AN7_Point_Walk_Extend, AN7_Point_Grid, AN7_Point_Tri, AN7_Point_TriHex, AN7_Point_Hex, AN7_Point_Volume, AN7_Point_Poisson, AN7_Point_Preview, AN7_Point_Preview_Apply, AN7_Point_Cache_Export, AN7_Point_Cache_Import
+
+###########################################################################
+# User preferences and UI rendering class
+
+class AN7PointGenPreferences(bpy.types.AddonPreferences):
+	bl_idname = __package__
+
+	show_feedback: bpy.props.BoolProperty(
+		name="Show Processing Feedback",
+		description='Displays relevant statistics from the last generated array',
+		default=True)
+
+	cache_budget: bpy.props.IntProperty(
+		name="Result Cache (MB)",
+		description='Memory used to keep recently generated arrays, so switching back to previous settings is instant (0 disables the cache)',
+		default=512,
+		soft_min=0,
+		soft_max=4096,
+		min=0,
+		max=65536)
+
+	preview_limit: bpy.props.IntProperty(
+		name="Preview Points",
+		description='Maximum number of points drawn by the live preview (larger arrays are decimated)',
+		default=100000,
+		soft_min=1000,
+		soft_max=1000000,
+		min=100,
+		max=10000000)
+
+	stream_threshold: bpy.props.IntProperty(
+		name="Stream Above",
+		description='Lattices with more points than this are generated in chunks through a temporary file, keeping the memory use flat (the points are arranged differently than an in-memory array with the same seed, 0 never streams)',
+		default=5000000,
+		soft_min=0,
+		soft_max=50000000,
+		min=0,)
+
+	profile_log: bpy.props.BoolProperty(
+		name="Log Stage Timings",
+		description='Prints the time spent in each processing stage to the system console after every generated array',
+		default=False)
+
+	def draw(self, context):
+		layout = self.layout
+		layout.prop(self, "show_feedback")
+		layout.prop(self, "cache_budget")
+		layout.prop(self, "preview_limit")
+		layout.prop(self, "stream_threshold")
+		layout.prop(self, "profile_log")
+
+def draw_profile(box):
+	# Per-stage breakdown of the last generated array (settings read, generation stages, mesh write), along with any rejection counts
+	if profiler.LAST is not None and bpy.context.preferences.addons[__package__].preferences.show_feedback:
+		boxcol=box.column()
+		for line in profiler.LAST.lines():
+			boxcol.label(text=line)
+
+def draw_mask(layout):
+	# Region mask settings, shared by every array type
+	settings = bpy.context.scene.an7_point_gen_settings
+	layout.prop(settings, 'mask_source')
+	if settings.mask_source == 'MESH':
+		layout.prop(settings, 'mask_object')
+	elif settings.mask_source == 'IMAGE':
+		layout.prop(settings, 'mask_image')
+		layout.prop(settings, 'mask_size')
+		layout.prop(settings, 'mask_threshold')
+
+def draw_estimate(box, settings):
+	# Point count, memory and time estimates of the selected array type (the count is exact for unmasked lattices, and an upper limit otherwise)
+	if settings.gen_type == 'WALK':
+		box.label(text="Up to " + str(estimate.point_count(settings)) + " points, memory: " + estimate.format_bytes(estimate.memory_estimate(settings)) + ", time: up to " + estimate.format_seconds(estimate.time_estimate(settings)))
+	elif settings.gen_type == 'POISSON':
+		box.label(text="Up to " + str(estimate.point_count(settings)) + " points, memory: " + estimate.format_bytes(estimate.memory_estimate(settings)) + ", time: " + estimate.format_seconds(estimate.time_estimate(settings)))
+	else:
+		count = str(estimate.point_count(settings)) + " points"
+		if settings.gen_type in ('CUBE', 'FCC', 'BCC'):
+			box.label(text=str(estimate.base_count(settings)) + " starting voxels, " + ("generate " if settings.mask_source == 'NONE' else "up to ") + count)
+		else:
+			box.label(text=("Generate " if settings.mask_source == 'NONE' else "Up to ") + count)
+		box.label(text="Memory: " + estimate.format_bytes(estimate.memory_estimate(settings, bpy.context.preferences.addons[__package__].preferences.stream_threshold)) + ", time: " + estimate.format_seconds(estimate.time_estimate(settings)))
+
+def draw_output(layout, box):
+	# Everything below the generate buttons, shared by every array type: the live preview (every type but the walk), the estimates, the feedback from the last run and its profile
+	settings = bpy.context.scene.an7_point_gen_settings
+	if settings.gen_type != 'WALK':
+		row = layout.row()
+		row.operator(AN7_Point_Preview.bl_idname, depress=preview.running())
+		row.operator(AN7_Point_Preview_Apply.bl_idname)
+		if preview.PREVIEW.drawn < preview.PREVIEW.count:
+			box.label(text="Preview: showing " + str(preview.PREVIEW.drawn) + " of " + str(preview.PREVIEW.count) + " points")
+	draw_estimate(box, settings)
+	if settings.gen_type in ('POISSON', 'WALK') and len(settings.feedback_time) > 0 and bpy.context.preferences.addons[__package__].preferences.show_feedback:
+		boxcol=box.column()
+		boxcol.label(text="Points created: " + settings.feedback_elements)
+		if settings.gen_type == 'WALK':
+			boxcol.label(text="Successive fails: " + settings.feedback_failures) # Alternative: consecutive?
+			boxcol.label(text="Total attempts: " + settings.feedback_attempts)
+		boxcol.label(text="Processing Time: " + settings.feedback_time)
+	draw_profile(box)
+	box.label(text="WARNING: replaces mesh")
+
+def mask_object_poll(self, obj):
+	return obj.type == 'MESH'
+
+###########################################################################
+# Project settings and UI rendering classes
+
+class an7PointGenSettings(bpy.types.PropertyGroup):
+	gen_type: bpy.props.EnumProperty(
+		name='Array Type',
+		description='Point array format',
+		items=[
+			('GRID', 'Rectangular Array', 'Rectangular layout of square points'),
+			('TRI', 'Triangular Array', 'Triangular layout of triangular points'),
+			('TRIHEX', 'Tri-Hex Array', 'Hexagonal layout of triangular points'),
+			('HEX', 'Hexagonal Array', 'Hexagonal layout of hexagonal points (will not subdivide without gaps)'),
+			('CUBE', 'Cubic Volume', 'Volumetric layout of cubic voxels, divided into eight (octree)'),
+			('FCC', 'Face Centred Volume', 'Face centred cubic packing of spheres (the densest packing), divided into eight (partly divided areas overlap where sizes meet)'),
+			('BCC', 'Body Centred Volume', 'Body centred cubic packing of spheres, divided into eight (partly divided areas overlap where sizes meet)'),
+			('POISSON', 'Poisson Disc Fill', 'Fills an area with randomly sized, non-overlapping points'),
+			('WALK', 'Random Walk', 'Generates a random string of points')
+			],
+		default='GRID')
+
+	# Grid settings
+	grid_count_X: bpy.props.IntProperty(
+		name="Grid Count",
+		description="Number of starting elements in the X axis",
+		default=8,
+		soft_min=2,
+		soft_max=20,
+		min=2,
+		max=100,)
+	grid_count_Y: bpy.props.IntProperty(
+		name="Grid Count",
+		description="Number of starting elements in the Y axis",
+		default=8,
+		soft_min=2,
+		soft_max=20,
+		min=2,
+		max=100,)
+
+	# Volumetric settings (X and Y counts are shared with the rectangular array)
+	grid_count_Z: bpy.props.IntProperty(
+		name="Grid Count",
+		description="Number of starting cells in the Z axis",
+		default=8,
+		soft_min=1,
+		soft_max=20,
+		min=1,
+		max=100,)
+
+	# Triangular settings
+	tri_count: bpy.props.IntProperty(
+		name="Array Count",
+		description="Number of starting rows generated across the diameter",
+		default=8,
+		soft_min=2,
+		soft_max=20,
+		min=2,
+		max=100,)
+
+	# Hexagonal settings
+	hex_count: bpy.props.IntProperty(
+		name="Array Count",
+		description="Number of starting elements in the radius axis",
+		default=4,
+		soft_min=1,
+		soft_max=10,
+		min=1,
+		max=100,)
+
+	# Shared settings
+	grid_spacing: bpy.props.FloatProperty(
+		name="Grid Spacing",
+		description="Spacing of each grid point at 0 divisions",
+		default=0.2,
+		step=10,
+		soft_min=0.1,
+		soft_max=1.0,
+		min=0.0001,
+		max=10.0,)
+	random_rotation: bpy.props.BoolProperty(
+		name="Random Rotation",
+		description="Rotate each point randomly, automatically limited to appropriate increments",
+		default=True,)
+	division_levels: bpy.props.IntProperty(
+		name="Divisions",
+		description="The number of times the algorithm will loop through dividing points",
+		default=2,
+		soft_min=0,
+		soft_max=4,
+		min=0,
+		max=8,)
+	division_percentage: bpy.props.FloatProperty(
+		name="Percentage",
+		description="Percentage chance that points will be selected for division",
+		default=0.5,
+		step=10,
+		soft_min=0.0,
+		soft_max=1.0,
+		min=0.0,
+		max=1.0,)
+	hierarchy: bpy.props.BoolProperty(
+		name="Hierarchy",
+		description="Keep the subdivision tree, adding level (number of divisions) and parent (shared by siblings) attributes to every point",
+		default=False,)
+	# Region mask settings (read by the operators, the generators only see the finished mask)
+	mask_source: bpy.props.EnumProperty(
+		name='Mask',
+		description='Limit the points to a region (lattice elements outside it are removed before they divide, walk and fill candidates outside it are rejected)',
+		items=[
+			('NONE', 'None', 'Use the whole array'),
+			('MESH', 'Mesh', 'Only inside the footprint of a mesh, seen from above (in the space of the selected object)'),
+			('IMAGE', 'Image', 'Only where a grayscale image is brighter than the threshold, with the brightness also scaling the division percentage'),
+			],
+		default='NONE')
+	mask_object: bpy.props.PointerProperty(
+		name="Mask Mesh",
+		description="Mesh whose footprint the points are limited to",
+		type=bpy.types.Object,
+		poll=mask_object_poll)
+	mask_image: bpy.props.PointerProperty(
+		name="Mask Image",
+		description="Grayscale image the points are limited to (brighter areas divide more often)",
+		type=bpy.types.Image)
+	mask_size: bpy.props.FloatVectorProperty(
+		name="Image Size",
+		description="Width and height covered by the mask image, centred on the object origin",
+		size=2,
+		default=[4.0, 4.0],
+		soft_min=0.1,
+		soft_max=100.0,
+		min=0.0001,
+		max=100000.0,)
+	mask_threshold: bpy.props.FloatProperty(
+		name="Threshold",
+		description="Brightness the mask image has to exceed for points to be created",
+		default=0.01,
+		step=10,
+		soft_min=0.0,
+		soft_max=1.0,
+		min=0.0,
+		max=1.0,)
+	seed: bpy.props.IntProperty(
+		name="Seed",
+		description="Random seed, the same seed and settings will always generate the same array",
+		default=0,
+		min=0,)
+
+	# Sphere Walk settings
+	walk_dimensions: bpy.props.EnumProperty(
+		name='Area Shape',
+		description='Mask for the area where points will be created',
+		items=[
+			('2D', '2D', 'Randomly walk in only X and Y dimensions'),
+			('3D', '3D', 'Randomly generate points in all 3 dimensions'),
+			],
+		default='3D')
+	walk_directionality: bpy.props.FloatProperty(
+		name="Directionality",
+		description="Amount to favour the specified vector when generating each step",
+		default=0.0,
+		step=10,
+		soft_min=0.0,
+		soft_max=1.0,
+		min=0.0,
+		max=1.0,)
+	walk_vector: bpy.props.FloatVectorProperty(
+		name="Vector",
+		subtype="XYZ",
+		description="Vector to favour when generating each step",
+		default=[1.0, 0.0, 0.0],
+		soft_min=-1.0,
+		soft_max=1.0,
+		min=-1.0,
+		max=1.0,)
+
+	radius_min: bpy.props.FloatProperty(
+		name="Point Radius",
+		description="Minimum scale of the generated points",
+		default=0.2,
+		step=10,
+		soft_min=0.1,
+		soft_max=1.0,
+		min=0.0001,
+		max=10.0,)
+	radius_max: bpy.props.FloatProperty(
+		name="Point Radius Maximum",
+		description="Maximum scale of the generated points",
+		default=0.8,
+		step=10,
+		soft_min=0.1,
+		soft_max=1.0,
+		min=0.0001,
+		max=10.0,)
+	radius_decay: bpy.props.BoolProperty(
+		name="Radius Decay",
+		description='Linearly reduces the maximum radius based on number of recursions and maximum number of elements',
+		default=False)
+
+	walk_rotation: bpy.props.EnumProperty(
+		name='Rotation',
+		description='Mask for the area where points will be created',
+		items=[
+			('RANDOM', 'Random', 'Assign a random rotation to each point'),
+			('AHEAD', 'Look Ahead', 'Each point will aim at the next point in the sequence'),
+			('BEHIND', 'Look Behind', 'Each point will aim at the previous point in the sequence'),
+			],
+		default='RANDOM')
+	walk_rotation_output: bpy.props.EnumProperty(
+		name='Rotation Output',
+		description='Extra rotation attribute to write alongside the Euler rotation attribute, ready for Geometry Nodes without any conversion',
+		items=[
+			('EULER', 'Euler', 'Only write the Euler rotation attribute'),
+			('QUATERNION', 'Quaternion', 'Also write a quaternion attribute (stored as a color before Blender 4.0)'),
+			('NORMAL', 'Normal', 'Also write a normal attribute, the direction each point faces (its X axis)'),
+			],
+		default='EULER')
+
+	max_elements: bpy.props.IntProperty(
+		name="Max Points",
+		description="The maximum number of points that can be created (higher numbers will attempt to fill the space more)",
+		default=300,
+		soft_min=10,
+		soft_max=1000,
+		min=1,
+		max=1000000,)
+	max_failures: bpy.props.IntProperty(
+		name="Max Failures",
+		description="The maximum number of consecutive failures before quitting (higher numbers won't give up when the odds are poor)",
+		default=1000,
+		soft_min=100,
+		soft_max=10000,
+		min=10,
+		max=100000,)
+	max_attempts: bpy.props.IntProperty(
+		name="Max Attempts",
+		description="The maximum number of placement attempts before quitting (higher numbers can take minutes to process)",
+		default=10000,
+		soft_min=1000,
+		soft_max=100000,
+		min=100,
+		max=1000000,)
+	walk_batch: bpy.props.IntProperty(
+		name="Batch Size",
+		description="Number of candidate points proposed and tested together (only affects speed, the generated walk is the same for any batch size)",
+		default=32,
+		soft_min=1,
+		soft_max=256,
+		min=1,
+		max=4096,)
+	walk_extend: bpy.props.IntProperty(
+		name="Extend Points",
+		description="Number of points to add when extending an existing walk",
+		default=100,
+		soft_min=10,
+		soft_max=1000,
+		min=1,
+		max=10000,)
+
+	walk_adaptive: bpy.props.BoolProperty(
+		name="Adaptive",
+		description="Backtrack out of dead ends, shrink the point radius as the space fills up, and optionally stop once placing points becomes too slow",
+		default=False,)
+	walk_backtrack: bpy.props.IntProperty(
+		name="Backtrack After",
+		description="Consecutive failures after which the walk drops its last point and continues from the one before it",
+		default=200,
+		soft_min=10,
+		soft_max=5000,
+		min=1,
+		max=100000,)
+	walk_min_rate: bpy.props.FloatProperty(
+		name="Minimum Rate",
+		description="Stop early once the walk is projected to place fewer points per second than this (0 never stops early; as this depends on the computer's speed, the same seed can stop at a different point)",
+		default=0.0,
+		step=100,
+		soft_min=0.0,
+		soft_max=1000.0,
+		min=0.0,
+		max=1000000.0,)
+
+	walk_chains: bpy.props.IntProperty(
+		name="Chains",
+		description="Number of independent walks, run in parallel on separate cores and merged (overlapping points of later chains are removed)",
+		default=1,
+		soft_min=1,
+		soft_max=64,
+		min=1,
+		max=1024,)
+	walk_spacing: bpy.props.FloatProperty(
+		name="Chain Spacing",
+		description="Distance between the starting points of the chains",
+		default=4.0,
+		step=10,
+		soft_min=0.0,
+		soft_max=20.0,
+		min=0.0,
+		max=1000.0,)
+
+	# Scene collision settings (read by the walk operators)
+	collision_mode: bpy.props.EnumProperty(
+		name='Collision',
+		description='Also reject walk points that touch a scene mesh, or lie on the wrong side of it (the mesh needs outward facing normals)',
+		items=[
+			('NONE', 'None', 'Only avoid earlier points of the walk'),
+			('INSIDE', 'Inside', 'Keep the walk inside a closed mesh, such as a vessel'),
+			('OUTSIDE', 'Outside', 'Keep the walk outside of a mesh, such as an obstacle'),
+			],
+		default='NONE')
+	collision_object: bpy.props.PointerProperty(
+		name="Collision Mesh",
+		description="Mesh the walk collides with (its tree is built once and reused until the mesh or its placement changes)",
+		type=bpy.types.Object,
+		poll=mask_object_poll)
+
+	feedback_elements: bpy.props.StringProperty(
+		name="Feedback",
+		description="Stores the total points from the last created array",
+		default="",)
+	feedback_failures: bpy.props.StringProperty(
+		name="Feedback",
+		description="Stores the maximum number of consecutive failures from the last created array",
+		default="",)
+	feedback_attempts: bpy.props.StringProperty(
+		name="Feedback",
+		description="Stores the total attempts from the last created array",
+		default="",)
+	feedback_time: bpy.props.StringProperty(
+		name="Feedback",
+		description="Stores the total time spent processing the last created array",
+		default="",)
+
+class AN7TOOLS_PT_point_gen(bpy.types.Panel):
+	bl_space_type = "VIEW_3D"
+	bl_region_type = "UI"
+	bl_category = 'AN7 Tools'
+	bl_order = 0
+	bl_label = "Point Generator"
+	bl_idname = "AN7TOOLS_PT_point_gen"
+
+	@classmethod
+	def poll(cls, context):
+		return True
+
+	def draw_header(self, context):
+		try:
+			layout = self.layout
+		except Exception as exc:
+			print(str(exc) + " | Error in the AN7 Point Generator panel header")
+
+	def draw(self, context):
+		try:
+			layout = self.layout
+			layout.use_property_split = True
+			layout.use_property_decorate = False # No animation
+
+			layout.prop(context.scene.an7_point_gen_settings, 'gen_type')
+
+			# Rectangular Array
+			if bpy.context.scene.an7_point_gen_settings.gen_type == "GRID":
+				row = layout.row()
+				row.prop(context.scene.an7_point_gen_settings, 'grid_count_X')
+				row.prop(context.scene.an7_point_gen_settings, 'grid_count_Y', text="")
+				layout.prop(context.scene.an7_point_gen_settings, 'grid_spacing')
+				layout.prop(context.scene.an7_point_gen_settings, 'random_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_levels')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_percentage')
+				layout.prop(context.scene.an7_point_gen_settings, 'hierarchy')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Grid.bl_idname)
+					draw_output(layout, box)
+
+			# Triangular Array
+			if bpy.context.scene.an7_point_gen_settings.gen_type == "TRI":
+				layout.prop(context.scene.an7_point_gen_settings, 'tri_count')
+				layout.prop(context.scene.an7_point_gen_settings, 'grid_spacing')
+				layout.prop(context.scene.an7_point_gen_settings, 'random_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_levels')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_percentage')
+				layout.prop(context.scene.an7_point_gen_settings, 'hierarchy')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Tri.bl_idname)
+					draw_output(layout, box)
+
+			# Tri-Hex Array
+			if bpy.context.scene.an7_point_gen_settings.gen_type == "TRIHEX":
+				layout.prop(context.scene.an7_point_gen_settings, 'hex_count')
+				layout.prop(context.scene.an7_point_gen_settings, 'grid_spacing')
+				layout.prop(context.scene.an7_point_gen_settings, 'random_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_levels')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_percentage')
+				layout.prop(context.scene.an7_point_gen_settings, 'hierarchy')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_TriHex.bl_idname)
+					draw_output(layout, box)
+
+			# Hexagonal Array
+			if bpy.context.scene.an7_point_gen_settings.gen_type == "HEX":
+				layout.prop(context.scene.an7_point_gen_settings, 'hex_count')
+				layout.prop(context.scene.an7_point_gen_settings, 'grid_spacing')
+				layout.prop(context.scene.an7_point_gen_settings, 'random_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_levels')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_percentage')
+				layout.prop(context.scene.an7_point_gen_settings, 'hierarchy')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Hex.bl_idname)
+					draw_output(layout, box)
+
+			# Cubic, Face Centred and Body Centred Volumes
+			if bpy.context.scene.an7_point_gen_settings.gen_type in ("CUBE", "FCC", "BCC"):
+				row = layout.row()
+				row.prop(context.scene.an7_point_gen_settings, 'grid_count_X')
+				row.prop(context.scene.an7_point_gen_settings, 'grid_count_Y', text="")
+				row.prop(context.scene.an7_point_gen_settings, 'grid_count_Z', text="")
+				layout.prop(context.scene.an7_point_gen_settings, 'grid_spacing')
+				layout.prop(context.scene.an7_point_gen_settings, 'random_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_levels')
+				layout.prop(context.scene.an7_point_gen_settings, 'division_percentage')
+				layout.prop(context.scene.an7_point_gen_settings, 'hierarchy')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Volume.bl_idname)
+					draw_output(layout, box)
+
+			# Poisson Disc Fill
+			if bpy.context.scene.an7_point_gen_settings.gen_type == "POISSON":
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_dimensions')
+				row = layout.row()
+				row.prop(context.scene.an7_point_gen_settings, 'radius_min')
+				row.prop(context.scene.an7_point_gen_settings, 'radius_max')
+				layout.prop(context.scene.an7_point_gen_settings, 'radius_decay')
+				layout.prop(context.scene.an7_point_gen_settings, 'max_elements')
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Poisson.bl_idname)
+					draw_output(layout, box)
+
+			# Random Walk
+			elif bpy.context.scene.an7_point_gen_settings.gen_type == "WALK":
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_dimensions')
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_directionality')
+				if bpy.context.scene.an7_point_gen_settings.walk_directionality > 0.0:
+					col=layout.column()
+					col.prop(context.scene.an7_point_gen_settings, 'walk_vector')
+
+				row = layout.row()
+				row.prop(context.scene.an7_point_gen_settings, 'radius_min')
+				row.prop(context.scene.an7_point_gen_settings, 'radius_max')
+				layout.prop(context.scene.an7_point_gen_settings, 'radius_decay')
+
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_rotation')
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_rotation_output')
+
+				layout.prop(context.scene.an7_point_gen_settings, 'max_elements')
+				layout.prop(context.scene.an7_point_gen_settings, 'max_failures')
+				layout.prop(context.scene.an7_point_gen_settings, 'max_attempts')
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_batch')
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_adaptive')
+				if bpy.context.scene.an7_point_gen_settings.walk_adaptive:
+					layout.prop(context.scene.an7_point_gen_settings, 'walk_backtrack')
+					layout.prop(context.scene.an7_point_gen_settings, 'walk_min_rate')
+				layout.prop(context.scene.an7_point_gen_settings, 'walk_chains')
+				if bpy.context.scene.an7_point_gen_settings.walk_chains > 1:
+					layout.prop(context.scene.an7_point_gen_settings, 'walk_spacing')
+
+				draw_mask(layout)
+				layout.prop(context.scene.an7_point_gen_settings, 'collision_mode')
+				if bpy.context.scene.an7_point_gen_settings.collision_mode != 'NONE':
+					layout.prop(context.scene.an7_point_gen_settings, 'collision_object')
+				layout.prop(context.scene.an7_point_gen_settings, 'seed')
+				box = layout.box()
+				if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+					layout.operator(AN7_Point_Walk.bl_idname)
+					layout.operator(AN7_Point_Walk_Modal.bl_idname)
+					row = layout.row()
+					row.prop(context.scene.an7_point_gen_settings, 'walk_extend')
+					row.operator(AN7_Point_Walk_Extend.bl_idname)
+					draw_output(layout, box)
+
+			# Point cache files
+			if bpy.context.view_layer.objects.active.type == "MESH" and bpy.context.object.mode == "OBJECT":
+				row = layout.row()
+				row.operator(AN7_Point_Cache_Export.bl_idname)
+				row.operator(AN7_Point_Cache_Import.bl_idname)
+
+			# Guidance feedback (coach the user on what will enable processing)
+			if bpy.context.view_layer.objects.active.type != "MESH":
+				box.label(text="Active item must be a mesh")
+			elif bpy.context.object.mode != "OBJECT":
+				box.label(text="Must be in object mode")
+
+		except Exception as exc:
+			print(str(exc) + " | Error in the AN7 Point Generator panel")
@@ -0,0 +1,213 @@
+###########################################################################
+# Subdivided lattice generators (no Blender imports)
+
+import functools
+import math
+
+import numpy as np
+
+from . import profiler
+from .points import Points, random_generator
+from .subdivision import SQUARE, TRIANGLE, HEXAGON, CUBE, FCC, BCC, Hierarchy, elements, subdivide, subdivide_chunks
+
+SINE_60 = 0.8660254037844386467637231707529361834714026269051903140279034897
+
+###########################################################################
+# Base lattice templates
+# The undivided lattices only depend on their counts, so they're built once at unit spacing (with index math instead of nested loops) and cached
+# Each run then only scales the cached positions by the grid spacing
+# Points come out in the same order the original loops appended them, since the subdivision shuffle (and so every seed) depends on it
+
+def _frozen(*arrays):
+	# Cached templates are shared between runs, so make sure nothing can modify them in place
+	for array in arrays:
+		array.flags.writeable = False
+	return arrays
+
+def _rows(lengths):
+	# Row and position-in-row of every element, for rows of the given lengths laid out one after the other
+	lengths = np.asarray(lengths, dtype=np.int64)
+	row = np.repeat(np.arange(len(lengths)), lengths)
+	column = np.arange(len(row)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+	return row, column
+
+@functools.lru_cache(maxsize=32)
+def grid_template(gridX, gridY):
+	# Rectangular lattice positions
+	x = np.repeat(np.arange(gridX, dtype=np.float64), gridY)
+	y = np.tile(np.arange(gridY, dtype=np.float64), gridX)
+	positions = np.zeros((gridX * gridY, 3))
+	positions[:, 0] = (x - gridX*0.5 + 0.5) * 2.0
+	positions[:, 1] = (y - gridY*0.5 + 0.5) * 2.0
+	return _frozen(positions)[0]
+
+@functools.lru_cache(maxsize=32)
+def tri_template(count):
+	# Triangular lattice positions and orientations
+	# Rows of 2a+1 triangles, alternating between pointing up and down (just the top-middle of the Tri-Hex pattern)
+	a, b = _rows(np.arange(count) * 2 + 1)
+	odd = b % 2
+	positions = np.zeros((len(a), 3))
+	positions[:, 0] = (a - b) * SINE_60
+	positions[:, 1] = (a * 1.5 + 1.0 - odd * 0.5) - count
+	rotation = np.where(odd == 0, math.pi, 0.0) # determine the orientation of the element
+	return _frozen(positions, rotation)
+
+@functools.lru_cache(maxsize=32)
+def trihex_template(count):
+	# Tri-Hex lattice positions and orientations
+	# Hexagonal grid points with triangular directions are created, and then mirrored to fill out all six "panels" (the order is randomised to do the division anyway)
+	a, b = _rows(np.arange(count) * 2 + 1)
+	odd = b % 2
+	rotA = np.where(odd == 0, 0.0, math.pi) # determine the orientation of the element
+	rotB = np.where(odd == 0, math.pi, 0.0)
+	middleX = (a - b) * SINE_60
+	middleY = a * 1.5 + 1.0 - odd * 0.5
+	sideX = (a * 2 + 1 - np.floor(b * 0.5 + 0.5)) * SINE_60
+	sideY = (b * 1.5 + 1.0 - odd * 0.5) * 0.5
+
+	# Six elements per grid point, in the original order: top-middle, top-right, top-left, bottom-middle, bottom-right, bottom-left
+	positions = np.zeros((len(a), 6, 3))
+	positions[:, :, 0] = np.stack((middleX, sideX, -sideX, middleX, sideX, -sideX), axis=1)
+	positions[:, :, 1] = np.stack((middleY, sideY, sideY, -middleY, -sideY, -sideY), axis=1)
+	rotation = np.stack((rotB, rotA, rotA, rotA, rotB, rotB), axis=1)
+	return _frozen(positions.reshape(-1, 3), rotation.reshape(-1))
+
+@functools.lru_cache(maxsize=32)
+def hex_template(count):
+	# Hexagonal lattice positions, spaced for a "furthest-point" radius of 1
+	# Hexagonal grid points are created ring by ring, and then shifted in counter-clockwise directions to fill out each row
+	space = 2.0 * SINE_60
+	x = space * 0.5 # cosine 60°
+	y = space * SINE_60 # sine 60°
+	a, b = _rows(np.arange(1, count))
+	a = a + 1.0
+	b = b.astype(np.float64)
+
+	# Six elements per grid point, in the original order: upper left, left, lower left, lower right, right, upper right
+	ring = np.zeros((len(a), 6, 3))
+	ring[:, :, 0] = np.stack((a * x - b * space, a * space - b * x, (a + b) * x, -a * x + b * space, -a * space + b * x, (-a - b) * x), axis=1)
+	ring[:, :, 1] = np.stack((a * y, b * y, (-a + b) * y, -a * y, -b * y, (a - b) * y), axis=1)
+	positions = np.concatenate((np.zeros((1, 3)), ring.reshape(-1, 3)))
+	return _frozen(positions)[0]
+
+# Volumetric lattices: the points of each conventional cubic cell (in units of the cell edge), and the cell edge that makes nearest neighbours touch at radius 1
+CELL_BASIS = {
+	'CUBE': ((0.0, 0.0, 0.0),),
+	'FCC': ((0.0, 0.0, 0.0), (0.0, 0.5, 0.5), (0.5, 0.0, 0.5), (0.5, 0.5, 0.0)),
+	'BCC': ((0.0, 0.0, 0.0), (0.5, 0.5, 0.5)),
+	}
+CELL_EDGE = {
+	'CUBE': 2.0,
+	'FCC': 2.0 * math.sqrt(2.0),
+	'BCC': 4.0 / math.sqrt(3.0),
+	}
+
+@functools.lru_cache(maxsize=32)
+def volume_template(kind, gridX, gridY, gridZ):
+	# Cubic, face centred or body centred lattice positions, gridX × gridY × gridZ cells centred on the origin
+	cells = np.indices((gridX, gridY, gridZ), dtype=np.float64).reshape(3, -1).T
+	positions = (cells[:, None, :] + np.array(CELL_BASIS[kind])[None, :, :]).reshape(-1, 3) * CELL_EDGE[kind]
+	positions -= (positions.max(axis=0) + positions.min(axis=0)) * 0.5
+	return _frozen(positions)[0]
+
+###########################################################################
+# Generators
+# With a region mask (see mask.py), elements outside it are culled before the division, and its density scales the division percentage locally
+
+# Division of each lattice type, and whether random rotation also scrambles the division layout
+DIVISIONS = {
+	'GRID': SQUARE,
+	'TRI': TRIANGLE,
+	'TRIHEX': TRIANGLE,
+	'HEX': HEXAGON, # hexagons don't evenly divide into more hexagons, so each one is split into three as a compromise
+	'CUBE': CUBE, # octree: eight half size cubes
+	'FCC': FCC,
+	'BCC': BCC,
+	}
+
+def base_lattice(settings):
+	# Undivided lattice of the selected type, scaled by the grid spacing
+	radius = settings.grid_spacing
+	if settings.gen_type in CELL_BASIS:
+		return elements(volume_template(settings.gen_type, settings.grid_count_X, settings.grid_count_Y, settings.grid_count_Z) * radius, radius)
+	elif settings.gen_type == 'GRID':
+		return elements(grid_template(settings.grid_count_X, settings.grid_count_Y) * radius, radius)
+	elif settings.gen_type == 'TRI':
+		positions, rotation = tri_template(settings.tri_count)
+		return elements(positions * radius, radius, rotation)
+	elif settings.gen_type == 'TRIHEX':
+		positions, rotation = trihex_template(settings.hex_count)
+		return elements(positions * radius, radius, rotation)
+	# Hexagons are compensated in the template for a "furthest-point" radius (which is how hexagons are generated using Cylinders in Blender) not a "flat side" radius (which is a larger object)
+	return elements(hex_template(settings.hex_count) * radius, radius)
+
+def point_rotation(settings, grid, rng):
+	# Point rotations, limited to the symmetry of each element shape when randomised
+	rotation = np.zeros((len(grid), 3), dtype=np.float32)
+	if settings.gen_type in ('TRI', 'TRIHEX'):
+		rotation[:, 2] = grid['rotation']
+		if settings.random_rotation:
+			rotation[:, 2] += rng.integers(0, 3, len(grid)) * 2.094395102393195492308428922186335 # 120° in radians
+	elif settings.random_rotation:
+		if settings.gen_type in CELL_BASIS:
+			rotation[:] = rng.integers(0, 4, (len(grid), 3)) * 1.570796326794896619231321691639751 # 90° about each axis, covering every orientation of the cube
+		elif settings.gen_type == 'GRID':
+			rotation[:, 2] = rng.integers(0, 4, len(grid)) * 1.570796326794896619231321691639751 # 90° in radians
+		else:
+			rotation[:, 2] = rng.integers(0, 6, len(grid)) * 1.047197551196597746154214461093168 # 60° in radians
+	return rotation
+
+def generate_lattice(settings, rng=None, mask=None):
+	# One random generator per run, so the same seed always gives the same array
+	rng = random_generator(settings.seed) if rng is None else rng
+
+	# Create initial grid
+	grid = base_lattice(settings)
+	profiler.lap("base lattice")
+
+	# Subdivide the grid
+	# For hexagons with random rotation on, the layout of each division is randomly flipped to prevent recursive triangle formations
+	tree = Hierarchy() if settings.hierarchy else None
+	grid = subdivide(grid, DIVISIONS[settings.gen_type], settings.division_levels, settings.division_percentage, rng, scramble=settings.random_rotation, tree=tree, mask=mask)
+
+	rotation = point_rotation(settings, grid, rng)
+	profiler.lap("rotation")
+
+	# Output container, with the level and parent attributes when the hierarchy was kept
+	if tree is None:
+		return Points(grid['position'], grid['radius'], rotation)
+	return Points(grid['position'], grid['radius'], rotation, attributes=tree.attributes(), hierarchy=tree)
+
+# One entry point per type, as the operators and the generator lookup use them
+generate_grid = generate_lattice
+generate_tri = generate_lattice
+generate_trihex = generate_lattice
+generate_hex = generate_lattice
+generate_volume = generate_lattice # cubic, FCC and BCC
+
+CHUNK = 65536 # points per chunk when streaming
+
+def generate_chunks(settings, size=CHUNK, rng=None):
+	# Yields the array as a series of Points chunks of roughly size points, so only one chunk is ever in memory (see subdivision.subdivide_chunks)
+	# The total is exactly estimate.point_count(settings), but the points come out grouped by lattice slice, so the array differs from generate_lattice for the same seed
+	# With the hierarchy kept, the parent attribute counts nodes across all chunks (the tree itself isn't kept)
+	rng = random_generator(settings.seed) if rng is None else rng
+	grid = base_lattice(settings)
+	profiler.lap("base lattice")
+	nodes = 0
+	for part, tree in subdivide_chunks(grid, DIVISIONS[settings.gen_type], settings.division_levels, settings.division_percentage, rng, size, scramble=settings.random_rotation, hierarchy=settings.hierarchy):
+		rotation = point_rotation(settings, part, rng)
+		profiler.lap("rotation")
+		if tree is None:
+			yield Points(part['position'], part['radius'], rotation)
+		else:
+			yield Points(part['position'], part['radius'], rotation, attributes={'level': tree.depth, 'parent': np.where(tree.parent >= 0, tree.parent + nodes, -1)})
+			nodes += len(tree.nodes)
+
+def generate_streamed(settings, rng=None, mask=None):
+	# The chunks of generate_chunks joined in memory, so an array that will be streamed can be previewed (and cached) exactly as it's written
+	# Only used for unmasked lattices, as masked arrays are never streamed
+	chunks = list(generate_chunks(settings, rng=rng))
+	attributes = {name: np.concatenate([chunk.attributes[name] for chunk in chunks]) for name in chunks[0].attributes}
+	return Points(np.concatenate([chunk.positions for chunk in chunks]), np.concatenate([chunk.scale for chunk in chunks]), np.concatenate([chunk.rotation for chunk in chunks]), attributes=attributes)
@@ -0,0 +1,147 @@
+###########################################################################
+# Region masks (no Blender imports)
+# A mask limits where points can be created: contains() tests an array of positions at once, and density() (0.0 to 1.0) scales the division percentage locally
+# Masks work in the XY plane of the target object, so they restrict the 2D footprint of every array type
+# Positions can have extra columns (such as the radius of a candidate), only the first two are read
+
+import hashlib
+
+import numpy as np
+
+from . import profiler
+
+class MeshMask:
+	# Footprint of a mesh, given as its triangles (T×3 vertices, only X and Y are used)
+	# The triangles are bucketed into a stack of uniform grids (a flat stand-in for a BVH), so each position is only tested against the few triangles sharing its cells
+	# The finest grid has cells about as large as a typical triangle, each coarser one doubles the cell size, and every triangle goes into the finest grid its bounding box fits into
+	# So a triangle never covers more than 2×2 cells, however mixed the triangle sizes are
+	def __init__(self, triangles):
+		triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)[:, :, :2]
+		# Faces standing perpendicular to the plane project to slivers without any area, and can't contain anything
+		area = (triangles[:, 1, 0] - triangles[:, 0, 0]) * (triangles[:, 2, 1] - triangles[:, 0, 1]) - (triangles[:, 1, 1] - triangles[:, 0, 1]) * (triangles[:, 2, 0] - triangles[:, 0, 0])
+		self.triangles = np.ascontiguousarray(triangles[np.abs(area) > 1e-12])
+		self.key = ('MESH', hashlib.blake2b(self.triangles.tobytes(), digest_size=16).hexdigest())
+
+		low = self.triangles.min(axis=1) if len(self.triangles) else np.zeros((0, 2))
+		high = self.triangles.max(axis=1) if len(self.triangles) else np.zeros((0, 2))
+		extent = (high - low).max(axis=1)
+		size = max(float(np.median(extent)) if len(self.triangles) else 1.0, 1e-6) # finest cells about as large as a typical triangle
+		level = np.ceil(np.log2(np.maximum(extent / size, 1.0))).astype(np.int64)
+		level += size * 2.0 ** level < extent # in case rounding left a cell a hair too small
+
+		# Every cell overlapped by each triangle's bounding box, sorted by cell, one (cell size, cell keys, triangles) entry per grid in use
+		self.grids = []
+		for grid in np.unique(level).tolist():
+			triangle = np.flatnonzero(level == grid)
+			cell = size * 2.0 ** grid
+			first = np.floor(low[triangle] / cell).astype(np.int64)
+			last = np.floor(high[triangle] / cell).astype(np.int64)
+			keys = []
+			members = []
+			for x in (0, 1):
+				for y in (0, 1):
+					covered = (first[:, 0] + x <= last[:, 0]) & (first[:, 1] + y <= last[:, 1])
+					keys.append(self._keys(first[covered, 0] + x, first[covered, 1] + y))
+					members.append(triangle[covered])
+			keys = np.concatenate(keys)
+			order = np.argsort(keys, kind='stable')
+			self.grids.append((cell, keys[order], np.concatenate(members)[order]))
+
+	def _keys(self, x, y):
+		# Cell coordinates packed into a single sortable integer
+		return ((x + 1073741824) << 31) | (y + 1073741824)
+
+	def contains(self, positions):
+		positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+		points = []
+		triangles = []
+		for size, cell_keys, cell_triangles in self.grids:
+			cells = np.floor(positions[:, :2] / size).astype(np.int64)
+			keys = self._keys(cells[:, 0], cells[:, 1])
+			start = np.searchsorted(cell_keys, keys, 'left')
+			counts = np.searchsorted(cell_keys, keys, 'right') - start
+			points.append(np.repeat(np.arange(len(positions)), counts))
+			triangles.append(cell_triangles[np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))])
+		point = np.concatenate(points) if points else np.zeros(0, dtype=np.int64)
+		triangle = np.concatenate(triangles) if triangles else np.zeros(0, dtype=np.int64)
+
+		# Same side of all three edges (in either winding)
+		p = positions[point, :2]
+		a = self.triangles[triangle, 0]
+		b = self.triangles[triangle, 1]
+		c = self.triangles[triangle, 2]
+		d1 = (b[:, 0] - a[:, 0]) * (p[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (p[:, 0] - a[:, 0])
+		d2 = (c[:, 0] - b[:, 0]) * (p[:, 1] - b[:, 1]) - (c[:, 1] - b[:, 1]) * (p[:, 0] - b[:, 0])
+		d3 = (a[:, 0] - c[:, 0]) * (p[:, 1] - c[:, 1]) - (a[:, 1] - c[:, 1]) * (p[:, 0] - c[:, 0])
+		inside = ((d1 >= 0.0) & (d2 >= 0.0) & (d3 >= 0.0)) | ((d1 <= 0.0) & (d2 <= 0.0) & (d3 <= 0.0))
+
+		result = np.zeros(len(positions), dtype=bool)
+		result[point[inside]] = True
+		return result
+
+	def density(self, positions):
+		return self.contains(positions).astype(np.float64)
+
+	def nearest(self, point):
+		# The point itself when it's inside, otherwise the closest triangle centre (where walks and fills start)
+		point = np.asarray(point, dtype=np.float64)
+		if len(self.triangles) == 0 or self.contains(point)[0]:
+			return tuple(point[:3])
+		centres = self.triangles.mean(axis=1)
+		closest = centres[np.argmin(((centres - point[:2]) ** 2).sum(axis=1))]
+		return (float(closest[0]), float(closest[1]), float(point[2]))
+
+# Masks of the mesh objects used so far, by object name: (geometry key, mask)
+# Bucketing the triangles is the expensive part, so a mask is only rebuilt when the mesh (or its placement relative to the points) changes
+MASKS = {}
+
+def mesh_mask(name, vertices, triangles):
+	# vertices (V×3) and triangles (T×3 vertex indices) of the mask mesh, in the space of the points
+	key = hashlib.blake2b(vertices.tobytes() + triangles.tobytes(), digest_size=16).hexdigest()
+	entry = MASKS.get(name)
+	if entry is None or entry[0] != key:
+		entry = MASKS[name] = (key, MeshMask(vertices[triangles]))
+		profiler.lap("mask build")
+	else:
+		profiler.count("mask reused")
+	return entry[1]
+
+class ImageMask:
+	# Grayscale image (rows from the bottom, as Blender stores pixels) stretched over bounds (min X, min Y, max X, max Y)
+	# Anything brighter than the threshold is inside, and the brightness is the density
+	def __init__(self, values, bounds, threshold=0.0):
+		self.values = np.ascontiguousarray(values, dtype=np.float32)
+		self.bounds = tuple(float(value) for value in bounds)
+		self.threshold = float(threshold)
+		self.key = ('IMAGE', hashlib.blake2b(self.values.tobytes(), digest_size=16).hexdigest(), self.values.shape, self.bounds, self.threshold)
+
+	def sample(self, positions):
+		# Nearest pixel value at every position (0.0 outside the image)
+		positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+		height, width = self.values.shape
+		minX, minY, maxX, maxY = self.bounds
+		u = (positions[:, 0] - minX) / (maxX - minX)
+		v = (positions[:, 1] - minY) / (maxY - minY)
+		inside = (u >= 0.0) & (u < 1.0) & (v >= 0.0) & (v < 1.0)
+		result = np.zeros(len(positions))
+		result[inside] = self.values[(v[inside] * height).astype(np.int64), (u[inside] * width).astype(np.int64)]
+		return result
+
+	def contains(self, positions):
+		return self.sample(positions) > self.threshold
+
+	def density(self, positions):
+		return np.clip(self.sample(positions), 0.0, 1.0)
+
+	def nearest(self, point):
+		# The point itself when it's inside, otherwise the closest pixel centre above the threshold (where walks and fills start)
+		point = np.asarray(point, dtype=np.float64)
+		rows, columns = np.nonzero(self.values > self.threshold)
+		if len(rows) == 0 or self.contains(point)[0]:
+			return tuple(point[:3])
+		height, width = self.values.shape
+		minX, minY, maxX, maxY = self.bounds
+		x = minX + (columns + 0.5) / width * (maxX - minX)
+		y = minY + (rows + 0.5) / height * (maxY - minY)
+		closest = np.argmin((x - point[0]) ** 2 + (y - point[1]) ** 2)
+		return (float(x[closest]), float(y[closest]), float(point[2]))
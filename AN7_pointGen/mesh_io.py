@@ -0,0 +1,95 @@
+###########################################################################
+# Bulk mesh reading and writing
+
+import bpy
+import numpy as np
+
+from . import profiler
+from .points import Points
+
+# Attribute name, Blender attribute type, and the property name used by foreach_set
+ATTRIBUTES = (
+	('index', 'FLOAT', 'value'),
+	('scale', 'FLOAT', 'value'),
+	('rotation', 'FLOAT_VECTOR', 'vector'),
+	)
+
+# Extra attribute types read back from a mesh: array type, values per point, and the property name used by foreach_get
+READ_TYPES = {
+	'INT': (np.int32, 1, 'value'),
+	'FLOAT': (np.float32, 1, 'value'),
+	'FLOAT_VECTOR': (np.float32, 3, 'vector'),
+	'QUATERNION': (np.float32, 4, 'value'),
+	'FLOAT_COLOR': (np.float32, 4, 'color'),
+	}
+
+def attribute_type(values):
+	# Blender attribute type and foreach_set property of an extra attribute array
+	if values.ndim > 1 and values.shape[1] == 4:
+		if bpy.app.version >= (4, 0, 0):
+			return 'QUATERNION', 'value'
+		return 'FLOAT_COLOR', 'color' # no quaternion attributes before Blender 4.0, but the four values still come through as a color
+	elif values.ndim > 1:
+		return 'FLOAT_VECTOR', 'vector'
+	return ('INT' if values.dtype.kind == 'i' else 'FLOAT'), 'value'
+
+def write_points(mesh, points):
+	# Replace all of the mesh data with the point array, writing each column in a single call instead of one vertex at a time
+	mesh.clear_geometry()
+	mesh.vertices.add(len(points))
+	mesh.vertices.foreach_set('co', points.positions.ravel())
+	profiler.lap("vertex creation")
+
+	for name, data_type, prop in ATTRIBUTES:
+		attribute = mesh.attributes.get(name)
+		if attribute is None:
+			attribute = mesh.attributes.new(name, data_type, 'POINT')
+		attribute.data.foreach_set(prop, getattr(points, name).ravel())
+
+	# Optional extra attributes, as integer, float, vector or quaternion point attributes
+	for name, values in points.attributes.items():
+		data_type, prop = attribute_type(values)
+		attribute = mesh.attributes.get(name)
+		if attribute is not None and attribute.data_type != data_type:
+			mesh.attributes.remove(attribute)
+			attribute = None
+		if attribute is None:
+			attribute = mesh.attributes.new(name, data_type, 'POINT')
+		attribute.data.foreach_set(prop, values.ravel())
+	profiler.lap("attribute writes")
+
+	mesh.update() # This ensures the viewport updates
+	profiler.lap("mesh update")
+
+def read_points(mesh):
+	# Read the mesh back into a point array, ordered by the index attribute (and chain_id first, when there is one), with missing attributes read as zeros
+	count = len(mesh.vertices)
+	positions = np.empty(count * 3, dtype=np.float32)
+	mesh.vertices.foreach_get('co', positions)
+
+	columns = {}
+	for name, data_type, prop in ATTRIBUTES:
+		values = np.zeros(count * (3 if data_type == 'FLOAT_VECTOR' else 1), dtype=np.float32)
+		attribute = mesh.attributes.get(name)
+		if attribute is not None and attribute.domain == 'POINT' and attribute.data_type == data_type:
+			attribute.data.foreach_get(prop, values)
+		columns[name] = values
+
+	# Every other point attribute (chain_id, level and parent, quaternion or normal, or anything added in Blender) comes along as an extra attribute
+	extra = {}
+	for attribute in mesh.attributes:
+		if attribute.domain != 'POINT' or attribute.name in columns or attribute.name == 'position' or attribute.name.startswith('.'):
+			continue
+		read = READ_TYPES.get(attribute.data_type)
+		if read is None or (attribute.data_type == 'FLOAT_COLOR' and bpy.app.version >= (4, 0, 0)):
+			continue # types the point array can't hold (colors only stand in for quaternions before Blender 4.0)
+		dtype, width, prop = read
+		values = np.zeros(count * width, dtype=dtype)
+		attribute.data.foreach_get(prop, values)
+		extra[attribute.name] = values.reshape(-1, width) if width > 1 else values
+
+	if 'chain_id' in extra:
+		order = np.lexsort((columns['index'], extra['chain_id'])) # multi-chain walks restart the index for every chain
+	else:
+		order = np.argsort(columns['index'], kind='stable')
+	return Points(positions.reshape(-1, 3)[order], columns['scale'][order], columns['rotation'].reshape(-1, 3)[order], columns['index'][order], {name: values[order] for name, values in extra.items()})
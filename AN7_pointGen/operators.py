@@ -0,0 +1,425 @@
+import bpy
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+import numpy as np
+import os
+import tempfile
+import time
+
+from . import collision
+from . import lattice
+from . import mesh_io
+from . import poisson
+from . import pointcache
+from . import preview
+from . import profiler
+from . import results
+from .generators import stream_points, streams
+from .mask import ImageMask, mesh_mask
+from .points import Settings, settings_dict, settings_key
+from .walk import Walk, extend_walk, generate_chains
+
+###########################################################################
+# Helper functions
+
+def walk_feedback(settings, walk, seconds, rate=None):
+	# Update the feedback strings (while a walk is still running, the current failure streak and attempt rate are shown instead)
+	if rate is None:
+		settings.feedback_elements = str(len(walk.points))
+		settings.feedback_failures = str(walk.failmax)
+		settings.feedback_attempts = str(walk.iteration)
+	else:
+		settings.feedback_elements = str(len(walk.points)) + " of " + str(walk.elements)
+		settings.feedback_failures = str(walk.count) + " (max " + str(max(walk.failmax, walk.count)) + ")"
+		settings.feedback_attempts = str(walk.iteration) + " (" + str(int(rate)) + " per second)"
+	settings.feedback_time = str(round(seconds, 2))
+
+def read_settings():
+	# Plain copy of the scene settings, so the generators never go through the property group (and the read shows up as its own stage)
+	settings = Settings(**settings_dict(bpy.context.scene.an7_point_gen_settings))
+	profiler.lap("settings read")
+	return settings
+
+def log_profile(settings, profile):
+	# Optionally print the per-stage breakdown to the system console
+	if bpy.context.preferences.addons[__package__].preferences.profile_log:
+		print("AN7 Point Generator " + settings.gen_type + " | " + ", ".join(profile.lines()))
+
+def mesh_triangles(source, obj):
+	# Vertices (V×3) and triangles (T×3 vertex indices) of the evaluated source mesh (modifiers applied), in the space of the object the points are written to
+	evaluated = source.evaluated_get(bpy.context.evaluated_depsgraph_get())
+	mesh = evaluated.to_mesh()
+	mesh.calc_loop_triangles()
+	vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+	mesh.vertices.foreach_get('co', vertices)
+	triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+	mesh.loop_triangles.foreach_get('vertices', triangles)
+	evaluated.to_mesh_clear()
+	matrix = np.array(obj.matrix_world.inverted() @ source.matrix_world)
+	return vertices.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3], triangles.reshape(-1, 3)
+
+def read_mask(obj):
+	# Region mask selected in the scene settings, in the space of the object the points are written to (None without one)
+	settings = bpy.context.scene.an7_point_gen_settings
+	if settings.mask_source == 'MESH' and settings.mask_object is not None and settings.mask_object.type == 'MESH':
+		# Footprint of the mesh, as triangles (only bucketed again when the evaluated mesh or its placement has changed)
+		vertices, triangles = mesh_triangles(settings.mask_object, obj)
+		mask = mesh_mask(settings.mask_object.name, vertices, triangles)
+	elif settings.mask_source == 'IMAGE' and settings.mask_image is not None and settings.mask_image.size[0] > 0:
+		# Grayscale of the image, centred on the object origin
+		width, height = settings.mask_image.size
+		pixels = np.empty(width * height * 4, dtype=np.float32)
+		settings.mask_image.pixels.foreach_get(pixels)
+		sizeX, sizeY = settings.mask_size
+		mask = ImageMask(pixels.reshape(height, width, 4)[:, :, :3].mean(axis=2), (-sizeX * 0.5, -sizeY * 0.5, sizeX * 0.5, sizeY * 0.5), settings.mask_threshold)
+	else:
+		return None
+	profiler.lap("mask read")
+	return mask
+
+def read_collider(obj):
+	# Collision mesh selected for the random walk, in the space of the walk object (None without one)
+	settings = bpy.context.scene.an7_point_gen_settings
+	if settings.collision_mode == 'NONE' or settings.collision_object is None or settings.collision_object.type != 'MESH':
+		return None
+	vertices, triangles = mesh_triangles(settings.collision_object, obj)
+	profiler.lap("collision read")
+	return collision.collider(settings.collision_object.name, vertices, triangles, settings.collision_mode)
+
+def result_cache():
+	# The shared result cache, resized to the budget set in the add-on preferences
+	results.CACHE.resize(bpy.context.preferences.addons[__package__].preferences.cache_budget * 1048576)
+	return results.CACHE
+
+def write_lattice(obj, settings, generator):
+	# Replace the mesh with a lattice, straight from the result cache when these settings were generated recently
+	# Above the streaming threshold, the lattice is generated chunk by chunk into a temporary point cache instead, and written to the mesh from the memory-mapped file, so the only full copy ever made is the mesh itself
+	# (masked arrays don't have a known count up front, so they're always generated in memory)
+	mask = read_mask(obj)
+	if streams(settings, bpy.context.preferences.addons[__package__].preferences.stream_threshold, mask):
+		path = os.path.join(bpy.app.tempdir or tempfile.gettempdir(), "an7_stream_" + str(os.getpid()) + ".an7p")
+		try:
+			stream_points(path, settings)
+			points, header = pointcache.load_points(path)
+			mesh_io.write_points(obj.data, points)
+			del points # releases the memory maps, so the file can be removed
+		finally:
+			if os.path.exists(path):
+				os.remove(path)
+	else:
+		mesh_io.write_points(obj.data, results.cached(settings, generator, result_cache(), mask))
+
+###########################################################################
+# Main classes
+
+class AN7_Point_Walk(bpy.types.Operator):
+	bl_idname = "an7pointwalk.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		# Get the currently active object
+		obj = bpy.context.object
+
+		# Start timer
+		timer = time.time()
+
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			mask = read_mask(obj)
+			collider = read_collider(obj)
+
+			# Reuse the walk if these exact settings (and mask and collision mesh) were generated recently
+			cache = result_cache()
+			key = settings_key(settings) + (None if mask is None else mask.key, None if collider is None else collider.key)
+			entry = cache.get(key)
+			profiler.lap("result cache")
+			if entry is not None:
+				points, feedback = entry
+				profiler.count("result cache hits")
+			elif settings.walk_chains > 1:
+				# Create points with independent walks running on every core
+				points, walks = generate_chains(settings, mask=mask, collider=collider)
+				feedback = (str(len(points)), str(max(walk.failmax for walk in walks)), str(sum(walk.iteration for walk in walks)))
+				cache.put(key, points, feedback)
+			else:
+				# Create points with the random walk
+				walk = Walk(settings, mask=mask, collider=collider).run()
+				points = walk.to_points()
+				feedback = (str(len(points)), str(walk.failmax), str(walk.iteration)) # only the statistics are kept, not the walk itself
+				cache.put(key, points, feedback)
+
+			# Update the feedback strings
+			context.scene.an7_point_gen_settings.feedback_elements, context.scene.an7_point_gen_settings.feedback_failures, context.scene.an7_point_gen_settings.feedback_attempts = feedback
+			context.scene.an7_point_gen_settings.feedback_time = str(round(time.time() - timer, 2))
+
+			# Replace object with new mesh data
+			mesh_io.write_points(obj.data, points)
+		log_profile(settings, profile)
+
+		return {'FINISHED'}
+
+class AN7_Point_Walk_Modal(bpy.types.Operator):
+	bl_idname = "an7pointwalkmodal.offset"
+	bl_label = "Replace Mesh with Progress"
+	bl_description = "Create points using the selected options in short time slices, showing progress and keeping Blender responsive (press Esc to stop early and keep the points placed so far), deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		# Without an interactive session (redo panel, scripts) just run the whole walk at once
+		return bpy.ops.an7pointwalk.offset()
+
+	def invoke(self, context, event):
+		# Multi-chain walks already run in worker processes, which can't be sliced up between timer events
+		if bpy.context.scene.an7_point_gen_settings.walk_chains > 1:
+			return bpy.ops.an7pointwalk.offset()
+
+		# Get the currently active object
+		self.obj = bpy.context.object
+		self.walk = Walk(bpy.context.scene.an7_point_gen_settings, mask=read_mask(self.obj), collider=read_collider(self.obj))
+		self.profile = profiler.Profile() # stages and counters of every slice, leaving out the time in between them
+
+		# Process the walk in time slices between timer events
+		self.timer = context.window_manager.event_timer_add(0.05, window=context.window)
+		context.window_manager.modal_handler_add(self)
+		context.window_manager.progress_begin(0, self.walk.elements)
+		return {'RUNNING_MODAL'}
+
+	def modal(self, context, event):
+		if event.type == 'ESC':
+			return self.finish(context)
+
+		if event.type == 'TIMER':
+			iteration = self.walk.iteration
+			seconds = self.walk.time
+			with profiler.recording() as profile:
+				self.walk.run(seconds=0.1) # short enough to keep the interface responsive
+			self.profile.merge(profile)
+			rate = (self.walk.iteration - iteration) / max(self.walk.time - seconds, 0.000001)
+
+			walk_feedback(context.scene.an7_point_gen_settings, self.walk, self.walk.time, rate)
+			context.window_manager.progress_update(len(self.walk.points))
+			for area in context.screen.areas:
+				if area.type == 'VIEW_3D':
+					area.tag_redraw() # This ensures the feedback box updates
+
+			if self.walk.finished():
+				return self.finish(context)
+
+		return {'PASS_THROUGH'}
+
+	def finish(self, context):
+		context.window_manager.event_timer_remove(self.timer)
+		context.window_manager.progress_end()
+
+		with profiler.recording() as profile:
+			profile.merge(self.profile)
+			# Whether the walk finished or was cancelled, keep every point placed so far
+			self.walk.run(seconds=0.0) # updates the final failure statistics without taking any more steps
+			points = self.walk.to_points()
+			walk_feedback(context.scene.an7_point_gen_settings, self.walk, self.walk.time)
+
+			# Replace object with new mesh data
+			mesh_io.write_points(self.obj.data, points)
+		log_profile(context.scene.an7_point_gen_settings, profile)
+
+		return {'FINISHED'}
+
+class AN7_Point_Walk_Extend(bpy.types.Operator):
+	bl_idname = "an7pointwalkextend.offset"
+	bl_label = "Extend Walk"
+	bl_description = "Continue the random walk in the selected mesh from its last point, adding more points to it"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		# Get the currently active object
+		obj = bpy.context.object
+		if obj.data.attributes.get('scale') is None or obj.data.attributes.get('index') is None:
+			self.report({'ERROR'}, "The selected mesh needs the scale and index attributes of a random walk")
+			return {'CANCELLED'}
+
+		# Start timer
+		timer = time.time()
+
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Read the existing walk and keep going from its last point
+			existing = mesh_io.read_points(obj.data)
+			profiler.lap("mesh read")
+			walk = extend_walk(settings, existing, mask=read_mask(obj), collider=read_collider(obj)).run()
+			points = walk.to_points()
+
+			# Update the feedback strings
+			walk_feedback(context.scene.an7_point_gen_settings, walk, time.time() - timer)
+
+			# Replace object with the extended mesh data (this also rewrites the normalised index attribute)
+			mesh_io.write_points(obj.data, points)
+		log_profile(settings, profile)
+
+		return {'FINISHED'}
+
+class AN7_Point_Grid(bpy.types.Operator):
+	bl_idname = "an7pointgrid.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Replace object with new mesh data
+			write_lattice(bpy.context.object, settings, lattice.generate_grid)
+		log_profile(settings, profile)
+		return {'FINISHED'}
+
+class AN7_Point_Tri(bpy.types.Operator):
+	bl_idname = "an7pointtri.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Replace object with new mesh data
+			write_lattice(bpy.context.object, settings, lattice.generate_tri)
+		log_profile(settings, profile)
+		return {'FINISHED'}
+
+class AN7_Point_TriHex(bpy.types.Operator):
+	bl_idname = "an7pointtrihex.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Replace object with new mesh data
+			write_lattice(bpy.context.object, settings, lattice.generate_trihex)
+		log_profile(settings, profile)
+		return {'FINISHED'}
+
+class AN7_Point_Hex(bpy.types.Operator):
+	bl_idname = "an7pointhex.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Replace object with new mesh data
+			write_lattice(bpy.context.object, settings, lattice.generate_hex)
+		log_profile(settings, profile)
+		return {'FINISHED'}
+
+class AN7_Point_Volume(bpy.types.Operator):
+	bl_idname = "an7pointvolume.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Replace object with new mesh data (cubic, FCC and BCC lattices share the same generator)
+			write_lattice(bpy.context.object, settings, lattice.generate_volume)
+		log_profile(settings, profile)
+		return {'FINISHED'}
+
+class AN7_Point_Poisson(bpy.types.Operator):
+	bl_idname = "an7pointpoisson.offset"
+	bl_label = "Replace Mesh" # "Create Points" is a lot nicer, but I'm concerned this is a real easy kill switch for important geometry!
+	bl_description = "Create points using the selected options, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		# Start timer
+		timer = time.time()
+
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# Create points with Poisson-disc sampling (straight from the result cache when these settings were generated recently)
+			points = results.cached(settings, poisson.generate_poisson, result_cache(), read_mask(bpy.context.object))
+
+			# Update the feedback strings
+			context.scene.an7_point_gen_settings.feedback_elements = str(len(points))
+			context.scene.an7_point_gen_settings.feedback_time = str(round(time.time() - timer, 2))
+
+			# Replace object with new mesh data
+			mesh_io.write_points(bpy.context.object.data, points)
+		log_profile(settings, profile)
+
+		return {'FINISHED'}
+
+class AN7_Point_Preview(bpy.types.Operator):
+	bl_idname = "an7pointpreview.offset"
+	bl_label = "Live Preview"
+	bl_description = "Toggle a viewport preview that follows the settings as they change, without replacing the mesh until the preview is applied"
+
+	def execute(self, context):
+		if preview.running():
+			preview.stop()
+		else:
+			preview.start()
+		return {'FINISHED'}
+
+class AN7_Point_Preview_Apply(bpy.types.Operator):
+	bl_idname = "an7pointpreviewapply.offset"
+	bl_label = "Apply Preview"
+	bl_description = "Replace the currently selected mesh with the previewed array and end the preview"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		if bpy.context.scene.an7_point_gen_settings.gen_type not in preview.GENERATORS:
+			self.report({'ERROR'}, "The live preview doesn't support the random walk")
+			return {'CANCELLED'}
+
+		with profiler.recording() as profile:
+			settings = read_settings()
+
+			# The previewed array is already in the result cache (arranged as it'd be streamed above the streaming threshold), so this is just the mesh write
+			mesh_io.write_points(bpy.context.object.data, results.cached(settings, preview.GENERATORS[settings.gen_type], result_cache(), read_mask(bpy.context.object), bpy.context.preferences.addons[__package__].preferences.stream_threshold))
+		log_profile(settings, profile)
+		preview.stop()
+		return {'FINISHED'}
+
+class AN7_Point_Cache_Export(bpy.types.Operator, ExportHelper):
+	bl_idname = "an7pointcacheexport.offset"
+	bl_label = "Export Cache"
+	bl_description = "Save the points of the selected mesh to a point cache file, along with the current settings and seed"
+	filename_ext = ".an7p"
+	filter_glob: bpy.props.StringProperty(default="*.an7p", options={'HIDDEN'})
+
+	def execute(self, context):
+		settings = settings_dict(bpy.context.scene.an7_point_gen_settings)
+		pointcache.save_points(self.filepath, mesh_io.read_points(bpy.context.object.data), {'type': settings['gen_type'], 'seed': settings['seed'], 'settings': settings})
+		return {'FINISHED'}
+
+class AN7_Point_Cache_Import(bpy.types.Operator, ImportHelper):
+	bl_idname = "an7pointcacheimport.offset"
+	bl_label = "Import Cache"
+	bl_description = "Load a point cache file, deleting and replacing the currently selected mesh"
+	bl_options = {'REGISTER', 'UNDO'}
+	filename_ext = ".an7p"
+	filter_glob: bpy.props.StringProperty(default="*.an7p", options={'HIDDEN'})
+
+	def execute(self, context):
+		try:
+			points, header = pointcache.load_points(self.filepath)
+		except (OSError, ValueError) as exc:
+			self.report({'ERROR'}, str(exc))
+			return {'CANCELLED'}
+
+		# The columns are memory-mapped, so they go straight from the file into the mesh
+		mesh_io.write_points(bpy.context.object.data, points)
+		return {'FINISHED'}
@@ -0,0 +1,119 @@
+###########################################################################
+# Binary point cache files (no Blender imports)
+#
+# Layout (little-endian):
+#   4 bytes  magic "AN7P"
+#   uint32   format version
+#   uint32   header length in bytes
+#   JSON     header (point count, column layout, and whatever generated the array: type, settings and seed), padded to 64 bytes
+#   float32  one contiguous block per column (positions N×3, scale N, index N, rotation N×3), each padded to 64 bytes
+#   any extra attributes (such as chain_id) follow as int32 or float32 blocks, listed by name and type (and width, for vectors and quaternions) in the header
+# Column-major blocks let a loader memory-map every column and hand it to foreach_set without copying or parsing anything
+
+import json
+import struct
+
+import numpy as np
+
+from .points import Points
+
+MAGIC = b'AN7P'
+VERSION = 1
+ALIGNMENT = 64
+COLUMNS = (('positions', 3), ('scale', 1), ('index', 1), ('rotation', 3))
+
+def _aligned(size):
+	return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _attribute(entry):
+	# (name, dtype, width) of an attribute declaration or header entry (the width is left out for single values)
+	name, dtype = entry[:2]
+	return name, dtype, int(entry[2]) if len(entry) > 2 else 1
+
+def _layout(count, start, attributes=()):
+	# Byte offset of every column block, followed by the extra attribute blocks
+	offsets = {}
+	for name, width in COLUMNS + tuple((name, width) for name, dtype, width in attributes):
+		offsets[name] = start
+		start = _aligned(start + count * width * 4)
+	return offsets, start
+
+class CacheWriter:
+	# Streams a point array to disk chunk by chunk, so arrays too big to hold in memory twice never need to be
+	# The total count has to be known up front (the lattice estimates are exact), and the index column is computed from it
+	# Extra attributes are declared as (name, dtype) pairs, with dtype '<i4' or '<f4', or (name, dtype, width) for vector attributes
+	def __init__(self, path, count, header=None, attributes=()):
+		self.count = count
+		self.written = 0
+		self.attributes = tuple(_attribute(entry) for entry in attributes)
+		header = dict(header or {}, count=count, columns=[[name, width] for name, width in COLUMNS], attributes=[[name, dtype] + ([width] if width > 1 else []) for name, dtype, width in self.attributes])
+		data = json.dumps(header).encode('utf-8')
+		start = _aligned(12 + len(data))
+		self.offsets, size = _layout(count, start, self.attributes)
+
+		self.file = open(path, 'wb')
+		self.file.write(MAGIC + struct.pack('<II', VERSION, len(data)) + data)
+		self.file.truncate(size) # reserves (sparse) space for every column
+
+	def write(self, points, keep_index=False):
+		# Append a chunk (the chunk's own index column is ignored, unless keep_index is set)
+		if self.written + len(points) > self.count:
+			raise ValueError("More points written to the cache than its header declared")
+		if keep_index:
+			index = points.index
+		else:
+			index = (np.arange(self.written, self.written + len(points), dtype=np.float64) / float(max(self.count - 1, 1))).astype('<f4')
+		for name, width in COLUMNS:
+			values = index if name == 'index' else np.ascontiguousarray(getattr(points, name), dtype='<f4')
+			self.file.seek(self.offsets[name] + self.written * width * 4)
+			self.file.write(values.tobytes())
+		for name, dtype, width in self.attributes:
+			self.file.seek(self.offsets[name] + self.written * width * 4)
+			self.file.write(np.ascontiguousarray(points.attributes[name], dtype=dtype).tobytes())
+		self.written += len(points)
+
+	def close(self):
+		self.file.close()
+		if self.written != self.count:
+			raise ValueError("Point cache closed after " + str(self.written) + " of " + str(self.count) + " points")
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		if exc[0] is None:
+			self.close()
+		else:
+			self.file.close()
+
+def save_points(path, points, header=None):
+	with CacheWriter(path, len(points), header, [(name, '<i4' if values.dtype.kind == 'i' else '<f4', values.shape[1] if values.ndim > 1 else 1) for name, values in points.attributes.items()]) as writer:
+		writer.write(points, keep_index=True) # a whole array keeps its own index (multi-chain walks restart it for every chain)
+
+def read_header(path):
+	with open(path, 'rb') as file:
+		magic = file.read(4)
+		if magic != MAGIC:
+			raise ValueError(str(path) + " is not an AN7 point cache")
+		version, length = struct.unpack('<II', file.read(8))
+		if version > VERSION:
+			raise ValueError(str(path) + " was written by a newer version of the point generator")
+		return json.loads(file.read(length).decode('utf-8')), _aligned(12 + length)
+
+def load_points(path):
+	# Returns (Points, header), with every column memory-mapped straight from the file
+	header, start = read_header(path)
+	count = header['count']
+	attributes = [_attribute(entry) for entry in header.get('attributes', [])]
+	offsets, size = _layout(count, start, attributes)
+	columns = {}
+	for name, width in COLUMNS:
+		if count == 0:
+			columns[name] = np.zeros((0, width), dtype=np.float32)
+		else:
+			columns[name] = np.memmap(path, dtype='<f4', mode='r', offset=offsets[name], shape=(count, width) if width > 1 else (count,))
+	extra = {}
+	for name, dtype, width in attributes:
+		shape = (count, width) if width > 1 else (count,)
+		extra[name] = np.zeros(shape, dtype=dtype) if count == 0 else np.memmap(path, dtype=dtype, mode='r', offset=offsets[name], shape=shape)
+	return Points(columns['positions'], columns['scale'], columns['rotation'], columns['index'], extra), header
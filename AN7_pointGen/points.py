@@ -0,0 +1,115 @@
+###########################################################################
+# Shared data containers (no Blender imports, so everything here also works headless)
+
+import numpy as np
+
+class Settings:
+	# Plain stand-in for the an7PointGenSettings property group
+	# The generators only read attributes, so the Blender property group can be passed in directly, while scripts and command line jobs can use this class instead
+	gen_type = 'GRID'
+	# Grid settings
+	grid_count_X = 8
+	grid_count_Y = 8
+	# Volumetric settings (grid_count_X and grid_count_Y are shared with the rectangular array)
+	grid_count_Z = 8
+	# Triangular settings
+	tri_count = 8
+	# Hexagonal settings
+	hex_count = 4
+	# Shared settings
+	grid_spacing = 0.2
+	random_rotation = True
+	division_levels = 2
+	division_percentage = 0.5
+	hierarchy = False
+	seed = 0
+	# Sphere Walk settings
+	walk_dimensions = '3D'
+	walk_directionality = 0.0
+	walk_vector = (1.0, 0.0, 0.0)
+	radius_min = 0.2
+	radius_max = 0.8
+	radius_decay = False
+	walk_rotation = 'RANDOM'
+	walk_rotation_output = 'EULER'
+	max_elements = 300
+	max_failures = 1000
+	max_attempts = 10000
+	walk_batch = 32
+	walk_extend = 100
+	walk_chains = 1
+	walk_spacing = 4.0
+	walk_adaptive = False
+	walk_backtrack = 200
+	walk_min_rate = 0.0
+
+	def __init__(self, **kwargs):
+		for name, value in kwargs.items():
+			if not hasattr(self, name):
+				raise TypeError("Unknown point generator setting: " + str(name))
+			setattr(self, name, value)
+
+# Settings that affect the output of each array type (walk_batch only changes the speed, and walk_extend only applies to extending)
+LATTICE_SETTINGS = ('grid_spacing', 'random_rotation', 'division_levels', 'division_percentage', 'hierarchy')
+GENERATOR_SETTINGS = {
+	'GRID': ('grid_count_X', 'grid_count_Y') + LATTICE_SETTINGS,
+	'TRI': ('tri_count',) + LATTICE_SETTINGS,
+	'TRIHEX': ('hex_count',) + LATTICE_SETTINGS,
+	'HEX': ('hex_count',) + LATTICE_SETTINGS,
+	'CUBE': ('grid_count_X', 'grid_count_Y', 'grid_count_Z') + LATTICE_SETTINGS,
+	'FCC': ('grid_count_X', 'grid_count_Y', 'grid_count_Z') + LATTICE_SETTINGS,
+	'BCC': ('grid_count_X', 'grid_count_Y', 'grid_count_Z') + LATTICE_SETTINGS,
+	'POISSON': ('walk_dimensions', 'radius_min', 'radius_max', 'radius_decay', 'max_elements'),
+	'WALK': ('walk_dimensions', 'walk_directionality', 'walk_vector', 'radius_min', 'radius_max', 'radius_decay', 'walk_rotation', 'walk_rotation_output', 'max_elements', 'max_failures', 'max_attempts', 'walk_chains', 'walk_spacing', 'walk_adaptive', 'walk_backtrack', 'walk_min_rate'),
+	}
+
+def settings_key(settings):
+	# Hashable key of everything that determines the generated array, seed included
+	values = [settings.gen_type, settings.seed]
+	for name in GENERATOR_SETTINGS[settings.gen_type]:
+		value = getattr(settings, name)
+		values.append(value if isinstance(value, (str, int, float, bool)) else tuple(value))
+	return tuple(values)
+
+def settings_names():
+	# Every setting the generators read, in declaration order
+	return [name for name in vars(Settings) if not name.startswith('_')]
+
+def settings_dict(settings):
+	# Plain, JSON friendly copy of any settings object (including the Blender property group)
+	values = {}
+	for name in settings_names():
+		value = getattr(settings, name)
+		values[name] = list(value) if not isinstance(value, (str, int, float, bool)) else value
+	return values
+
+class Points:
+	# Contiguous output arrays, ready to be written to a mesh in bulk
+	# positions (N×3), scale (N), index (N) and rotation (N×3), all float32 to match Blender's attribute storage
+	# Optional extra per-point attributes (such as chain_id) are kept by name, as int32 or float32 arrays (N, or N×3 and N×4 for vectors and quaternions)
+	# Subdivided lattices generated with their hierarchy also carry it as hierarchy (see subdivision.Hierarchy)
+	def __init__(self, positions, scale, rotation, index=None, attributes=None, hierarchy=None):
+		self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+		self.scale = np.ascontiguousarray(scale, dtype=np.float32).reshape(-1)
+		self.rotation = np.ascontiguousarray(rotation, dtype=np.float32).reshape(-1, 3)
+		self.index = normalized_index(len(self.positions)) if index is None else np.ascontiguousarray(index, dtype=np.float32).reshape(-1)
+		self.hierarchy = hierarchy
+		self.attributes = {}
+		for name, values in (attributes or {}).items():
+			values = np.asarray(values)
+			self.attributes[name] = np.ascontiguousarray(values, dtype=np.int32 if values.dtype.kind in 'iub' else np.float32).reshape((-1,) + values.shape[1:2])
+
+	def __len__(self):
+		return len(self.positions)
+
+	@property
+	def nbytes(self):
+		return self.positions.nbytes + self.scale.nbytes + self.index.nbytes + self.rotation.nbytes + sum(values.nbytes for values in self.attributes.values()) + (self.hierarchy.nbytes if self.hierarchy is not None else 0)
+
+def normalized_index(count):
+	# 0.0 for the first point through 1.0 for the last point, in creation order
+	return (np.arange(count, dtype=np.float64) / float(max(count - 1, 1))).astype(np.float32)
+
+def random_generator(seed):
+	# Every generator draws from a single seeded NumPy generator per run, so results can be reproduced (or regenerated elsewhere) from the seed alone
+	return np.random.default_rng(seed)
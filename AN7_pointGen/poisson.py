@@ -0,0 +1,93 @@
+###########################################################################
+# Variable radius Poisson-disc fill (no Blender imports)
+# Bridson's algorithm: new points are only proposed around points on the active list, and a point is retired after a fixed number of failed proposals, so the work grows linearly with the number of points
+# Instead of one active point at a time, every active point proposes a candidate in each round, and the whole round is tested at once
+
+import math
+
+import numpy as np
+
+from . import profiler
+from .points import Points, random_generator
+from .spatial import CellHash, SortedGrid
+
+CANDIDATES = 30 # failed proposals before an active point is retired (Bridson's k)
+ROUND = 16384 # most active points proposing candidates in a single round
+
+def generate_poisson(settings, rng=None, mask=None):
+	# With a region mask (see mask.py), candidates outside it are rejected before the overlap test, so the fill takes the shape of the mask
+	# One random generator per run, so the same seed always gives the same array
+	rng = random_generator(settings.seed) if rng is None else rng
+
+	# Properties settings
+	dimensions = True if settings.walk_dimensions == "3D" else False
+	rMinimum = settings.radius_min
+	rMaximum = settings.radius_max
+	elements = settings.max_elements
+	components = 3 if dimensions else 2
+	cell = 2.0 * max(rMinimum, rMaximum) # largest possible distance between two overlapping points
+
+	def radius_limit(count):
+		# Upper end of the random radius range, shrinking towards the minimum radius as the fill grows when decay is enabled
+		if settings.radius_decay:
+			lerp = count / elements
+			return (rMinimum * lerp) + (rMaximum * (1.0 - lerp))
+		return rMaximum
+
+	# Point data (x, y, z, radius) in creation order, starting with a single point at the origin
+	data = np.zeros((elements, 4))
+	data[0, 3] = rMinimum + (radius_limit(0) - rMinimum) * rng.random()
+	if mask is not None:
+		data[0, :3] = mask.nearest(data[0, :3]) # moved inside the mask when the origin isn't
+	count = 1
+	grid = CellHash(data, cell, dimensions) # only new points are added to it, so each round costs the same however big the fill gets
+	grid.add(count)
+	failures = np.zeros(elements, dtype=np.int32)
+	active = np.zeros(1, dtype=np.int64)
+
+	while len(active) > 0 and count < elements:
+		# One candidate around each of the proposing points, between one and two touching distances away
+		proposing = rng.permutation(active)[:ROUND]
+		size = len(proposing)
+		radius = rMinimum + (radius_limit(count) - rMinimum) * rng.random(size)
+		vec = np.zeros((size, 3))
+		vec[:, :components] = rng.standard_normal((size, components)) # uniformly distributed directions once normalised
+		length = np.sqrt(vec[:, 0]*vec[:, 0] + vec[:, 1]*vec[:, 1] + vec[:, 2]*vec[:, 2])
+		scale = np.divide((radius + data[proposing, 3]) * (1.0 + rng.random(size)), length, out=np.zeros(size), where=length > 0.0)
+		candidates = np.empty((size, 4))
+		candidates[:, :3] = vec * scale[:, None] + data[proposing, :3]
+		candidates[:, 3] = radius
+
+		# Keep the candidates inside the mask that don't overlap any existing point
+		if mask is None:
+			accepted = ~grid.overlaps(candidates)
+			profiler.count("rejected (overlap)", size - int(accepted.sum()))
+		else:
+			accepted = mask.contains(candidates)
+			inside = np.flatnonzero(accepted)
+			profiler.count("rejected (mask)", size - len(inside))
+			accepted[inside] = ~grid.overlaps(candidates[inside])
+			profiler.count("rejected (overlap)", len(inside) - int(accepted.sum()))
+
+		# Candidates from the same round can still overlap each other, in which case only the first one is kept
+		free = np.flatnonzero(accepted)
+		query, other = SortedGrid(candidates[free], cell, dimensions).pairs(candidates[free])
+		accepted[free[query[other < query]]] = False
+		profiler.count("rejected (same round)", len(free) - int(accepted.sum()))
+		winners = np.flatnonzero(accepted)[:elements - count]
+
+		# Failed proposals count towards retiring their active point, and the new points join the active list
+		failures[proposing[~accepted]] += 1
+		data[count:count + len(winners)] = candidates[winners]
+		active = np.concatenate((active[failures[active] < CANDIDATES], np.arange(count, count + len(winners))))
+		count += len(winners)
+		grid.add(count)
+
+	data = data[:count]
+	profiler.lap("poisson rounds")
+
+	# Point rotations
+	rotation = rng.uniform(-math.pi, math.pi, (count, 3))
+	profiler.lap("rotation")
+
+	return Points(data[:, :3], data[:, 3], rotation)
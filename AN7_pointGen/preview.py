@@ -0,0 +1,127 @@
+###########################################################################
+# Live viewport preview
+# Draws the array as a GPU overlay on the active object while the settings are tweaked, so nothing touches the mesh (or the undo stack) until the preview is applied
+
+import bpy
+import gpu
+from gpu_extras.batch import batch_for_shader
+import math
+import time
+
+from . import lattice
+from . import poisson
+from . import results
+from .points import settings_key
+
+# Array types that can be previewed (the random walk can take minutes, so it isn't regenerated on every change)
+GENERATORS = {
+	'GRID': lattice.generate_grid,
+	'TRI': lattice.generate_tri,
+	'TRIHEX': lattice.generate_trihex,
+	'HEX': lattice.generate_hex,
+	'CUBE': lattice.generate_volume,
+	'FCC': lattice.generate_volume,
+	'BCC': lattice.generate_volume,
+	'POISSON': poisson.generate_poisson,
+	}
+
+INTERVAL = 0.1 # seconds between checks for changed settings
+DEBOUNCE = 0.25 # seconds the settings have to stay unchanged before the array is regenerated (dragging a slider doesn't generate every step)
+COLOR = (1.0, 0.5, 0.1, 1.0)
+
+class Preview:
+	def __init__(self):
+		self.handler = None
+		self.shader = None
+		self.batch = None
+		self.pending = None # settings key last seen by the timer
+		self.changed = 0.0 # time the settings last changed
+		self.built = None # settings key of the array being drawn
+		self.count = 0 # points in the full array
+		self.drawn = 0 # points actually drawn after decimation
+
+# Shared by the whole Blender session
+PREVIEW = Preview()
+
+def running():
+	return PREVIEW.handler is not None
+
+def start():
+	if running():
+		return
+	try:
+		PREVIEW.shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+	except ValueError:
+		PREVIEW.shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR') # name used before Blender 4.0
+	PREVIEW.handler = bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+	PREVIEW.pending = None
+	PREVIEW.built = None
+	bpy.app.timers.register(update, first_interval=0.0)
+
+def stop():
+	if bpy.app.timers.is_registered(update):
+		bpy.app.timers.unregister(update)
+	if PREVIEW.handler is not None:
+		bpy.types.SpaceView3D.draw_handler_remove(PREVIEW.handler, 'WINDOW')
+	PREVIEW.__init__()
+	redraw()
+
+def redraw():
+	for window in bpy.context.window_manager.windows:
+		for area in window.screen.areas:
+			if area.type == 'VIEW_3D':
+				area.tag_redraw()
+
+def mask_state(settings):
+	# Cheap stand-in for the mask in the change check (reading the mask itself every interval would be too slow, so edits to the mask mesh or image only show after another change)
+	if settings.mask_source == 'MESH':
+		return ('MESH', settings.mask_object.name if settings.mask_object is not None else None)
+	elif settings.mask_source == 'IMAGE':
+		return ('IMAGE', settings.mask_image.name if settings.mask_image is not None else None, tuple(settings.mask_size), settings.mask_threshold)
+	return (None,)
+
+def update():
+	# Timer callback: regenerate the preview once the settings have stopped changing
+	settings = bpy.context.scene.an7_point_gen_settings
+	if settings.gen_type not in GENERATORS:
+		if PREVIEW.batch is not None:
+			PREVIEW.batch = None
+			PREVIEW.built = None
+			redraw()
+		return INTERVAL
+
+	stream = bpy.context.preferences.addons[__package__].preferences.stream_threshold
+	key = settings_key(settings) + mask_state(settings) + (stream,)
+	if key != PREVIEW.pending:
+		PREVIEW.pending = key
+		PREVIEW.changed = time.time()
+	elif key != PREVIEW.built and time.time() - PREVIEW.changed >= DEBOUNCE:
+		# Generated through the result cache, so applying the preview afterwards only has to write the mesh
+		from .operators import read_mask, result_cache
+		points = results.cached(settings, GENERATORS[settings.gen_type], result_cache(), read_mask(bpy.context.object) if bpy.context.object is not None else None, stream)
+
+		# Level of detail: above the point limit only every nth point is drawn
+		limit = bpy.context.preferences.addons[__package__].preferences.preview_limit
+		step = max(1, int(math.ceil(len(points) / float(limit))))
+		positions = points.positions[::step]
+
+		PREVIEW.batch = batch_for_shader(PREVIEW.shader, 'POINTS', {"pos": positions})
+		PREVIEW.built = key
+		PREVIEW.count = len(points)
+		PREVIEW.drawn = len(positions)
+		redraw()
+	return INTERVAL
+
+def draw():
+	# Draw handler: the preview points in the space of the active object, where the mesh would be written
+	obj = bpy.context.object
+	if PREVIEW.batch is None or obj is None:
+		return
+	gpu.matrix.push()
+	gpu.matrix.multiply_matrix(obj.matrix_world)
+	if hasattr(gpu, 'state'):
+		gpu.state.point_size_set(3.0)
+	PREVIEW.shader.bind()
+	PREVIEW.shader.uniform_float("color", COLOR)
+	PREVIEW.batch.draw(PREVIEW.shader)
+	gpu.matrix.pop()
@@ -0,0 +1,82 @@
+###########################################################################
+# Per-stage timing and counters (no Blender imports)
+# The generators and the mesh writer mark the end of each stage with lap(), which costs next to nothing unless an operator is recording
+# Stages are laps rather than nested blocks: each lap is the time since the previous one, so a recording always adds up to its total time
+
+import time
+
+class Profile:
+	# Seconds per stage (in the order the stages first ran) and counters, such as rejected candidates by cause
+	def __init__(self):
+		self.stages = {}
+		self.counts = {}
+		self.last = time.perf_counter()
+
+	def lap(self, name):
+		now = time.perf_counter()
+		self.add(name, now - self.last)
+		self.last = now
+
+	def add(self, name, seconds):
+		self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+	def count(self, name, amount=1):
+		self.counts[name] = self.counts.get(name, 0) + amount
+
+	def merge(self, other):
+		# Add in the stages and counters recorded somewhere else (such as a worker process)
+		for name, seconds in other.stages.items():
+			self.add(name, seconds)
+		for name, amount in other.counts.items():
+			self.count(name, amount)
+
+	def total(self):
+		return sum(self.stages.values())
+
+	def lines(self):
+		# Human readable breakdown, one line per stage and counter
+		total = self.total()
+		lines = []
+		for name, seconds in self.stages.items():
+			lines.append(name + ": " + str(round(seconds * 1000.0, 1)) + " ms (" + str(int(round(100.0 * seconds / total if total > 0.0 else 0.0))) + "%)")
+		lines.append("total: " + str(round(total * 1000.0, 1)) + " ms")
+		for name, amount in self.counts.items():
+			lines.append(name + ": " + str(amount))
+		return lines
+
+class NullProfile:
+	# Stand-in used whenever nothing is recording
+	def lap(self, name):
+		pass
+
+	def add(self, name, seconds):
+		pass
+
+	def count(self, name, amount=1):
+		pass
+
+	def merge(self, other):
+		pass
+
+CURRENT = NullProfile()
+LAST = None # the last finished recording, shown in the panel
+
+def lap(name):
+	CURRENT.lap(name)
+
+def count(name, amount=1):
+	CURRENT.count(name, amount)
+
+class recording:
+	# with recording() as profile: ...
+	# Everything marked inside the block goes to a fresh Profile, which is kept as LAST afterwards
+	def __enter__(self):
+		global CURRENT
+		self.previous = CURRENT
+		self.profile = CURRENT = Profile()
+		return self.profile
+
+	def __exit__(self, *exc):
+		global CURRENT, LAST
+		CURRENT = self.previous
+		LAST = self.profile
@@ -0,0 +1,62 @@
+###########################################################################
+# In-process cache of recently generated arrays (no Blender imports)
+# Switching back to a previous configuration reuses its arrays instead of generating them again
+
+from collections import OrderedDict
+
+from . import profiler
+from .generators import generate_streamed, streams
+from .points import settings_key
+
+class ResultCache:
+	# Least recently used cache of point arrays, limited by their total size in bytes
+	def __init__(self, budget=0):
+		self.budget = budget
+		self.entries = OrderedDict()
+		self.nbytes = 0
+
+	def get(self, key):
+		# Returns (points, extra), or None when the key isn't cached
+		entry = self.entries.get(key)
+		if entry is not None:
+			self.entries.move_to_end(key)
+		return entry
+
+	def put(self, key, points, extra=None):
+		if key in self.entries:
+			self.nbytes -= self.entries.pop(key)[0].nbytes
+		if points.nbytes > self.budget:
+			return # too big to ever fit, so don't flush everything else for it
+		self.entries[key] = (points, extra)
+		self.nbytes += points.nbytes
+		self.trim()
+
+	def resize(self, budget):
+		self.budget = budget
+		self.trim()
+
+	def trim(self):
+		# Drop the least recently used arrays until everything fits in the budget
+		while self.nbytes > self.budget and self.entries:
+			self.nbytes -= self.entries.popitem(last=False)[1][0].nbytes
+
+	def clear(self):
+		self.entries.clear()
+		self.nbytes = 0
+
+# Shared by every operator in this Blender session
+CACHE = ResultCache()
+
+def cached(settings, generator, cache=CACHE, mask=None, stream=0):
+	# Returns the cached array for these settings (and region mask), or generates and caches it
+	# Lattices above the streaming threshold are generated as they'd be streamed (see generators.streams), which arranges the points differently, so the key records which arrangement is cached
+	streamed = streams(settings, stream, mask)
+	key = settings_key(settings) + (None if mask is None else mask.key, streamed)
+	entry = cache.get(key)
+	profiler.lap("result cache")
+	if entry is not None:
+		profiler.count("result cache hits")
+		return entry[0]
+	points = generate_streamed(settings) if streamed else generator(settings, mask=mask)
+	cache.put(key, points)
+	return points
@@ -0,0 +1,82 @@
+###########################################################################
+# Point rotation math (no Blender imports)
+# NumPy versions of the mathutils conversions the random walk aims its points with, working on whole arrays at once
+# Quaternions are (w, x, y, z) and Euler angles use Blender's default XYZ order, matching mathutils to the float precision
+
+import numpy as np
+
+# Tracking axis for Vector.to_track_quat(track, 'Z'): the sign of the local X axis that points along the vector
+TRACK = {'X': 1.0, '-X': -1.0}
+
+def track_quaternions(vectors, track='X'):
+	# Same as Vector(vector).to_track_quat(track, 'Z') for every row of vectors (N×3), zero vectors giving the identity
+	# Port of Blender's vec_to_quat() for the X tracking axes: the shortest arc turning X onto the vector, followed by a roll around the vector that brings Z as close to up as it gets
+	vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+	t = vectors * TRACK[track]
+	length = np.sqrt((t * t).sum(axis=1))
+	valid = length > 0.0
+	safe = np.where(valid, length, 1.0)
+
+	# Arc from X to the vector, around the axis X × vector (or Y when they're already parallel)
+	axis = np.stack((np.zeros(len(t)), -t[:, 2], t[:, 1]), axis=1)
+	axis[(np.abs(t[:, 1]) + np.abs(t[:, 2]) < 1e-4), 1] = 1.0
+	axis /= np.sqrt((axis * axis).sum(axis=1))[:, None]
+	half = 0.5 * np.arccos(np.clip(t[:, 0] / safe, -1.0, 1.0))
+	arc = np.concatenate((np.cos(half)[:, None], axis * np.sin(half)[:, None]), axis=1)
+
+	# Roll around the vector, from the last row of the arc's rotation matrix
+	matrix = quaternion_matrix(arc)
+	roll = -0.5 * np.arctan2(matrix[:, 2, 1], matrix[:, 2, 2])
+	twist = np.concatenate((np.cos(roll)[:, None], t * (np.sin(roll) / safe)[:, None]), axis=1)
+
+	quaternions = multiply_quaternions(twist, arc)
+	quaternions[~valid] = (1.0, 0.0, 0.0, 0.0)
+	return quaternions
+
+def multiply_quaternions(a, b):
+	# Row by row quaternion product a × b (b applied first)
+	w1, x1, y1, z1 = a.T
+	w2, x2, y2, z2 = b.T
+	return np.stack((
+		w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+		w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+		w1 * y2 + y1 * w2 + z1 * x2 - x1 * z2,
+		w1 * z2 + z1 * w2 + x1 * y2 - y1 * x2,
+		), axis=1)
+
+def quaternion_matrix(quaternions):
+	# Rotation matrices (N×3×3) of unit quaternions, laid out like Blender's quat_to_mat3(): matrix[:, i] is the rotated i axis
+	w, x, y, z = (np.asarray(quaternions, dtype=np.float64).reshape(-1, 4) * np.sqrt(2.0)).T
+	return np.stack((
+		np.stack((1.0 - y * y - z * z, w * z + x * y, x * z - w * y), axis=1),
+		np.stack((x * y - w * z, 1.0 - x * x - z * z, w * x + y * z), axis=1),
+		np.stack((w * y + x * z, y * z - w * x, 1.0 - x * x - y * y), axis=1),
+		), axis=1)
+
+def matrix_euler(matrix):
+	# XYZ Euler angles of rotation matrices (port of Blender's mat3_normalized_to_eul(), which picks the smaller of the two possible solutions)
+	cy = np.hypot(matrix[:, 0, 0], matrix[:, 0, 1])
+	first = np.stack((np.arctan2(matrix[:, 1, 2], matrix[:, 2, 2]), np.arctan2(-matrix[:, 0, 2], cy), np.arctan2(matrix[:, 0, 1], matrix[:, 0, 0])), axis=1)
+	second = np.stack((np.arctan2(-matrix[:, 1, 2], -matrix[:, 2, 2]), np.arctan2(-matrix[:, 0, 2], -cy), np.arctan2(-matrix[:, 0, 1], -matrix[:, 0, 0])), axis=1)
+	euler = np.where((np.abs(first).sum(axis=1) > np.abs(second).sum(axis=1))[:, None], second, first)
+	# Gimbal lock: X and Z turn around the same axis, so all of it goes to X
+	locked = cy <= 16.0 * np.finfo(np.float32).eps
+	euler[locked] = np.stack((np.arctan2(-matrix[locked, 2, 1], matrix[locked, 1, 1]), np.arctan2(-matrix[locked, 0, 2], cy[locked]), np.zeros(int(locked.sum()))), axis=1)
+	return euler
+
+def quaternion_euler(quaternions):
+	# Same as Quaternion(q).to_euler() for every row
+	quaternions = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+	return matrix_euler(quaternion_matrix(quaternions / np.sqrt((quaternions * quaternions).sum(axis=1))[:, None]))
+
+def euler_quaternion(euler):
+	# Same as Euler(e).to_quaternion() for every row (port of Blender's eul_to_quat())
+	i, j, h = (np.asarray(euler, dtype=np.float64).reshape(-1, 3) * 0.5).T
+	ci, cj, ch = np.cos(i), np.cos(j), np.cos(h)
+	si, sj, sh = np.sin(i), np.sin(j), np.sin(h)
+	cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+	return np.stack((cj * cc + sj * ss, cj * sc - sj * cs, cj * ss + sj * cc, cj * cs - sj * sc), axis=1)
+
+def quaternion_normal(quaternions):
+	# Direction the local X axis of each point faces (the aim direction of a tracked point)
+	return quaternion_matrix(quaternions)[:, 0]
@@ -0,0 +1,192 @@
+###########################################################################
+# Spatial acceleration structures (no Blender imports)
+
+import math
+
+import numpy as np
+
+class SpatialHash:
+	# Uniform hash grid used to accelerate overlap checks
+	# Cells are at least as large as the biggest possible sum of two radii, so any overlapping pair of points will always be found in neighbouring cells
+	# Only occupied Z layers are searched, so a walk that stays on one plane only ever looks at one layer, while points that leave it (a 2D walk with a Z direction vector) are still found
+	def __init__(self, cell_size):
+		self.size = cell_size
+		self.layers = {} # number of stored points in each Z layer
+		self.cells = {}
+
+	def key(self, point):
+		return (math.floor(point[0] / self.size), math.floor(point[1] / self.size), math.floor(point[2] / self.size))
+
+	def insert(self, point):
+		key = self.key(point)
+		self.cells.setdefault(key, []).append(point)
+		self.layers[key[2]] = self.layers.get(key[2], 0) + 1
+
+	def remove(self, point):
+		# Drop a stored point (searching from the most recently inserted, which is the one a backtracking walk removes)
+		key = self.key(point)
+		cell = self.cells[key]
+		for i in range(len(cell) - 1, -1, -1):
+			if cell[i] == point:
+				del cell[i]
+				break
+		if not cell:
+			del self.cells[key]
+		self.layers[key[2]] -= 1
+		if not self.layers[key[2]]:
+			del self.layers[key[2]]
+
+	def overlaps(self, point):
+		cx, cy, cz = self.key(point)
+		layers = [z for z in (cz - 1, cz, cz + 1) if z in self.layers]
+		for x in (cx - 1, cx, cx + 1):
+			for y in (cy - 1, cy, cy + 1):
+				for z in layers:
+					for p in self.cells.get((x, y, z), ()):
+						dx = p[0] - point[0]
+						dy = p[1] - point[1]
+						dz = p[2] - point[2]
+						if math.sqrt(dx*dx + dy*dy + dz*dz) < (p[3] + point[3]):
+							return True
+		return False
+
+	def nearby(self, point, reach=1):
+		# Every stored point within the given number of cells of the point, as an (M×4) array for vectorised tests
+		cx, cy, cz = self.key(point)
+		layers = [z for z in range(cz - reach, cz + reach + 1) if z in self.layers]
+		found = []
+		for x in range(cx - reach, cx + reach + 1):
+			for y in range(cy - reach, cy + reach + 1):
+				for z in layers:
+					found.extend(self.cells.get((x, y, z), ()))
+		return np.array(found, dtype=np.float64).reshape(-1, 4)
+
+class SortedGrid:
+	# Hash grid over a fixed (N×4) point array, built by sorting the points by cell, so a whole array of query points can be tested at once
+	# Cells follow the same rule as SpatialHash (at least the biggest possible sum of two radii)
+	def __init__(self, data, cell_size, dimensions=True):
+		self.size = cell_size
+		layers = (-1, 0, 1) if dimensions else (0,)
+		self.shifts = [(x << 42) + (y << 21) + z for x in (-1, 0, 1) for y in (-1, 0, 1) for z in layers] # neighbouring cells as offsets of the packed keys
+		keys = self.keys(data)
+		self.order = np.argsort(keys, kind='stable')
+		self.data = data[self.order]
+		# Occupied cells, with the range of sorted points in each (plus an empty end marker, so every lookup lands on a valid slot)
+		keys = keys[self.order]
+		first = np.flatnonzero(np.diff(keys, prepend=-1)) if len(keys) else np.zeros(0, dtype=np.int64)
+		self.cells = np.append(keys[first], np.iinfo(np.int64).max)
+		self.starts = np.append(first, len(keys))
+		self.counts = np.append(np.diff(first, append=len(keys)), 0)
+
+	def keys(self, data):
+		# Cell coordinates packed into a single sortable integer (21 bits per axis)
+		cells = np.floor(data[:, :3] / self.size).astype(np.int64) + 1048576
+		return (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+
+	def pairs(self, queries):
+		# Every (query, stored point) pair that overlaps, as two index arrays (stored points are indexed in their original order)
+		keys = self.keys(queries)
+		order = np.argsort(keys) # sorted lookups are much faster
+		keys = keys[order]
+		found_query = []
+		found_point = []
+		for shift in self.shifts:
+			shifted = keys + shift
+			slot = np.searchsorted(self.cells, shifted)
+			counts = np.where(self.cells[slot] == shifted, self.counts[slot], 0)
+			total = int(counts.sum())
+			if total == 0:
+				continue
+			query = np.repeat(order, counts)
+			point = np.repeat(self.starts[slot] - np.cumsum(counts) + counts, counts) + np.arange(total)
+			delta = self.data[point, :3] - queries[query, :3]
+			distance = np.sqrt(delta[:, 0]*delta[:, 0] + delta[:, 1]*delta[:, 1] + delta[:, 2]*delta[:, 2])
+			hit = distance < self.data[point, 3] + queries[query, 3]
+			found_query.append(query[hit])
+			found_point.append(self.order[point[hit]])
+		if not found_query:
+			return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+		return np.concatenate(found_query), np.concatenate(found_point)
+
+	def overlaps(self, queries):
+		# One boolean per query point: does it overlap any stored point
+		# Queries drop out as soon as one overlap is found, starting with their own cell where most overlaps are
+		keys = self.keys(queries)
+		remaining = np.argsort(keys)
+		keys = keys[remaining]
+		result = np.zeros(len(queries), dtype=bool)
+		for shift in sorted(self.shifts, key=lambda shift: shift != 0):
+			shifted = keys + shift
+			slot = np.searchsorted(self.cells, shifted)
+			counts = np.where(self.cells[slot] == shifted, self.counts[slot], 0)
+			total = int(counts.sum())
+			if total == 0:
+				continue
+			query = np.repeat(remaining, counts)
+			point = self.data[np.repeat(self.starts[slot] - np.cumsum(counts) + counts, counts) + np.arange(total)]
+			delta = point[:, :3] - queries[query, :3]
+			distance = np.sqrt(delta[:, 0]*delta[:, 0] + delta[:, 1]*delta[:, 1] + delta[:, 2]*delta[:, 2])
+			result[query[distance < point[:, 3] + queries[query, 3]]] = True
+			keep = ~result[remaining]
+			remaining = remaining[keep]
+			keys = keys[keep]
+		return result
+
+class CellHash:
+	# Append-only hash grid over a growing (capacity×4) point array, for fills that keep testing new candidates against every point placed so far
+	# Points are linked into their cell's bucket as they're added (a head per bucket and a next per point), so adding and querying never touch the existing points
+	# Distant cells can share a bucket, which only adds a few extra distance tests; cells follow the same rule as SpatialHash (at least the biggest possible sum of two radii)
+	def __init__(self, data, cell_size, dimensions=True):
+		self.data = data
+		self.size = cell_size
+		self.count = 0 # rows of data linked so far
+		self.mask = (1 << max(10, (2 * len(data)).bit_length())) - 1 # at least twice as many buckets as points
+		self.head = np.full(self.mask + 1, -1, dtype=np.int64)
+		self.next = np.full(len(data), -1, dtype=np.int64)
+		layers = (-1, 0, 1) if dimensions else (0,)
+		self.shifts = np.array(sorted(((x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in layers), key=lambda shift: abs(shift[0]) + abs(shift[1]) + abs(shift[2])), dtype=np.int64) # own cell first, then the faces, edges and corners
+
+	def buckets(self, cells):
+		return ((cells[:, 0] * 73856093) ^ (cells[:, 1] * 19349663) ^ (cells[:, 2] * 83492791)) & self.mask
+
+	def add(self, stop):
+		# Link the rows from the last one added up to stop (sorted by bucket, so a batch sharing a bucket is chained in one go)
+		new = np.arange(self.count, stop)
+		if len(new) == 0:
+			return
+		buckets = self.buckets(np.floor(self.data[new, :3] / self.size).astype(np.int64))
+		order = np.argsort(buckets, kind='stable')
+		new = new[order]
+		buckets = buckets[order]
+		change = buckets[1:] != buckets[:-1]
+		first = np.concatenate(([True], change))
+		last = np.concatenate((change, [True]))
+		self.next[new[:-1]] = new[1:]
+		self.next[new[last]] = self.head[buckets[last]]
+		self.head[buckets[first]] = new[first]
+		self.count = stop
+
+	def overlaps(self, queries):
+		# One boolean per query point: does it overlap any point added so far
+		# Neighbouring cells are visited nearest first (most overlaps are found in a query's own cell), and queries drop out at their first overlap
+		# Within a cell, all remaining queries walk their bucket one link at a time together
+		cells = np.floor(queries[:, :3] / self.size).astype(np.int64)
+		remaining = np.arange(len(queries))
+		result = np.zeros(len(queries), dtype=bool)
+		for shift in self.shifts:
+			query = remaining
+			pointer = self.head[self.buckets(cells[query] + shift)]
+			while len(query):
+				live = pointer >= 0
+				query = query[live]
+				pointer = pointer[live]
+				point = self.data[pointer]
+				delta = point[:, :3] - queries[query, :3]
+				hit = np.sqrt(delta[:, 0]*delta[:, 0] + delta[:, 1]*delta[:, 1] + delta[:, 2]*delta[:, 2]) < point[:, 3] + queries[query, 3]
+				result[query[hit]] = True
+				query = query[~hit]
+				pointer = self.next[pointer[~hit]]
+			remaining = remaining[~result[remaining]]
+			if len(remaining) == 0:
+				break
+		return result
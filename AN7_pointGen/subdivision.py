@@ -0,0 +1,276 @@
+###########################################################################
+# Batched subdivision engine (no Blender imports)
+
+import math
+
+import numpy as np
+
+from . import profiler
+from .estimate import split_count, division_counts
+
+# Every element of a level lives in one structured array, so a whole division pass is a handful of array operations instead of per-element list work
+ELEMENT = np.dtype([('position', np.float32, 3), ('radius', np.float32), ('rotation', np.float32)])
+# The same with the parent node of each element, while keeping the hierarchy (the parent moves along with its element in every shuffle)
+TREE_ELEMENT = np.dtype([('position', np.float32, 3), ('radius', np.float32), ('rotation', np.float32), ('parent', np.int32)])
+
+SINE_60 = 0.8660254037844386467637231707529361834714026269051903140279034897
+EULER_GAMMA = 0.57721566490153286060651209008240243104215933593992 # Euler's Constant is the magic number that fixes everything (see the hexagonal division)
+
+class Division:
+	# Describes how one element splits into its children
+	# offsets: child offsets in units of half the parent radius (one row per child)
+	# flip: children that take the opposite orientation of their parent (rotation π - parent)
+	# orient: mirror the offsets of parents pointing down (rotation π), as the triangles need
+	# scramble: randomly mirror the offsets of each parent, as the hexagons do to break up repeating patterns
+	def __init__(self, offsets, flip=None, orient=False, scramble=False):
+		self.offsets = np.array(offsets, dtype=np.float64)
+		self.flip = np.zeros(len(self.offsets), dtype=bool) if flip is None else np.array(flip, dtype=bool)
+		self.orient = orient
+		self.scramble = scramble
+
+	def __len__(self):
+		return len(self.offsets)
+
+SQUARE = Division([
+	[1.0, -1.0, 0.0],
+	[1.0, 1.0, 0.0],
+	[-1.0, 1.0, 0.0],
+	[-1.0, -1.0, 0.0],
+	])
+
+TRIANGLE = Division([
+	[0.0, 0.0, 0.0], # middle
+	[0.0, 1.0, 0.0], # top
+	[SINE_60, -0.5, 0.0], # lower left
+	[-SINE_60, -0.5, 0.0], # lower right
+	], flip=[True, False, False, False], orient=True)
+
+HEXAGON = Division([
+	[0.0, 2.0 * SINE_60 * EULER_GAMMA, 0.0], # top
+	[1.5 * EULER_GAMMA, -SINE_60 * EULER_GAMMA, 0.0], # lower left
+	[-1.5 * EULER_GAMMA, -SINE_60 * EULER_GAMMA, 0.0], # lower right
+	], scramble=True)
+
+def cell_division(a, b, c):
+	# Eight children at (±a ± b ± c) / 4 for the primitive cell vectors a, b and c of a lattice with radius 1
+	# Together they fill the parent's cell with the same lattice at half the spacing, so fully divided regions stay a perfect packing
+	vectors = np.array((a, b, c), dtype=np.float64)
+	return Division([(np.array(signs) @ vectors) * 0.5 for signs in np.indices((2, 2, 2)).reshape(3, -1).T * 2 - 1])
+
+# Octree division of cubic voxels (edge 2, like the squares)
+CUBE = cell_division((2.0, 0.0, 0.0), (0.0, 2.0, 0.0), (0.0, 0.0, 2.0))
+# Face and body centred cubic packings, with the cube edge that makes nearest neighbours touch at radius 1 (2√2 and 4/√3)
+FCC = cell_division((0.0, math.sqrt(2.0), math.sqrt(2.0)), (math.sqrt(2.0), 0.0, math.sqrt(2.0)), (math.sqrt(2.0), math.sqrt(2.0), 0.0))
+BCC = cell_division((-2.0 / math.sqrt(3.0), 2.0 / math.sqrt(3.0), 2.0 / math.sqrt(3.0)), (2.0 / math.sqrt(3.0), -2.0 / math.sqrt(3.0), 2.0 / math.sqrt(3.0)), (2.0 / math.sqrt(3.0), 2.0 / math.sqrt(3.0), -2.0 / math.sqrt(3.0)))
+
+class Hierarchy:
+	# Implicit tree of a subdivided lattice, filled in by subdivide()
+	# Every divided element is kept as a node (nodes, with node_parent and node_depth), and every output point records its parent node and depth
+	# Parent -1 means an element of the undivided lattice, and points with the same parent are siblings from one division
+	def __init__(self):
+		self.nodes = np.zeros(0, dtype=TREE_ELEMENT)
+		self.node_parent = np.zeros(0, dtype=np.int32)
+		self.node_depth = np.zeros(0, dtype=np.int32)
+		self.points = np.zeros(0, dtype=TREE_ELEMENT)
+		self.parent = np.zeros(0, dtype=np.int32)
+		self.depth = np.zeros(0, dtype=np.int32)
+		self.reach = 1.0 # distance covered by an element and all of its descendants, in units of its radius
+
+	@property
+	def nbytes(self):
+		return self.nodes.nbytes + self.points.nbytes + self.depth.nbytes
+
+	def attributes(self):
+		# Extra mesh attributes: the subdivision level of each point, and its parent node
+		return {'level': self.depth, 'parent': self.parent}
+
+	def within(self, center, distance):
+		# Indices of the points that can touch a sphere around the center, found by descending the tree (whole families are skipped when their parent is out of reach)
+		center = np.asarray(center, dtype=np.float32)
+		near = np.sqrt(((self.points['position'] - center) ** 2).sum(axis=1)) < distance + self.reach * self.points['radius']
+		if len(self.nodes) == 0:
+			return np.flatnonzero(near) # nothing was divided, so every point belongs to the undivided lattice
+		selected = np.zeros(len(self.nodes), dtype=bool)
+		for depth in range(int(self.node_depth.max()) + 1):
+			level = np.flatnonzero(self.node_depth == depth)
+			reached = np.sqrt(((self.nodes['position'][level] - center) ** 2).sum(axis=1)) < distance + self.reach * self.nodes['radius'][level]
+			if depth > 0:
+				reached &= selected[self.node_parent[level]]
+			selected[level] = reached
+		near &= (self.parent < 0) | selected[np.maximum(self.parent, 0)]
+		return np.flatnonzero(near)
+
+def elements(positions, radius, rotation=0.0):
+	# Pack a base lattice into a level array
+	grid = np.zeros(len(positions), dtype=ELEMENT)
+	grid['position'] = positions
+	grid['radius'] = radius
+	grid['rotation'] = rotation
+	return grid
+
+def _divide(parents, division, rng, scramble, level, first=None):
+	# Write the children of every parent into the level array (len(parents) × children elements), one strided slice per child offset
+	# With first set, the children also record their parent node (numbered from first)
+	children = len(division)
+	split = len(parents)
+
+	# Scale every parent's offset table at once (half the parent radius, mirrored where needed)
+	scale = parents['radius'] * 0.5
+	if division.orient:
+		scale = np.where(parents['rotation'] < 1.0, scale, -scale)
+	if division.scramble and scramble:
+		scale = np.where(rng.integers(0, 2, split) == 0, -scale, scale)
+	flipped = np.float32(math.pi) - parents['rotation']
+
+	for c in range(children):
+		child = level[c::children]
+		child['position'] = parents['position'] + division.offsets[c] * scale[:, None]
+		child['radius'] = parents['radius'] * 0.5
+		child['rotation'] = flipped if division.flip[c] else parents['rotation']
+		if first is not None:
+			child['parent'] = np.arange(first, first + split, dtype=np.int32)
+
+def _fill_tree(tree, division, nodes, buffer, counts):
+	# Fill in the tree (nodes are numbered in the order they were divided, and every settled element of a level has that level's depth)
+	tree.node_depth = np.repeat(np.arange(len(nodes), dtype=np.int32), [len(level) for level in nodes])
+	tree.nodes = np.concatenate(nodes) if nodes else np.zeros(0, dtype=TREE_ELEMENT)
+	tree.node_parent = tree.nodes['parent']
+	tree.points = buffer
+	tree.parent = buffer['parent']
+	tree.depth = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+	tree.reach = float(np.sqrt((division.offsets ** 2).sum(axis=1)).max()) + math.sqrt(2.0) # offsets of every generation below (halving each time) plus the corner of the smallest element
+
+def subdivide(grid, division, levels, percentage, rng, scramble=True, tree=None, mask=None, splits=None):
+	# Returns every settled element in level order (undivided elements of each level, then the last level), each level shuffled
+	# Everything happens inside one buffer allocated at the exact final size (the same counts the panel estimate shows):
+	# settled elements fill it from the front, and the current level always sits right behind them, so the two ranges never overlap
+	# Each level fits in the space left over, because every element it holds ends up as at least one settled element
+	# With a Hierarchy passed in as tree, the divided elements are kept as its nodes (the random draws are the same either way, so so is the output)
+	# splits can fix the number of elements divided at each level instead of taking the percentage of the level (see subdivide_chunks)
+	if mask is not None:
+		return _subdivide_masked(grid, division, levels, percentage, rng, scramble, tree, mask)
+	children = len(division)
+	if splits is None:
+		counts = division_counts(len(grid), children, levels, percentage)
+	else:
+		counts = _split_counts(len(grid), children, splits)
+	buffer = np.empty(sum(counts), dtype=ELEMENT if tree is None else TREE_ELEMENT)
+	start = 0
+	count = len(grid)
+	for name in ELEMENT.names:
+		buffer[name][:count] = grid[name]
+	if tree is not None:
+		buffer['parent'][:count] = -1
+		nodes = []
+	for rec in range(levels):
+		level = buffer[start:start + count]
+		rng.shuffle(level)
+		profiler.lap("shuffle")
+		split = split_count(count, percentage) if splits is None else int(splits[rec])
+		# The elements at the end of the shuffled level are divided, the ones in front of them stay where they are
+		# These aren't iterated over again, so the division is entirely level based, with no compounding
+		start += count - split
+		parents = level[count - split:].copy()
+		first = None
+		if tree is not None:
+			first = sum(len(level) for level in nodes)
+			nodes.append(parents)
+
+		# Write the children straight into the buffer
+		count = split * children
+		_divide(parents, division, rng, scramble, buffer[start:start + count], first)
+		profiler.lap("division level " + str(rec + 1))
+
+	rng.shuffle(buffer[start:start + count])
+	profiler.lap("shuffle")
+
+	if tree is not None:
+		_fill_tree(tree, division, nodes, buffer, counts)
+	return buffer
+
+def _subdivide_masked(grid, division, levels, percentage, rng, scramble, tree, mask):
+	# Same division with a region mask: elements outside the mask are culled before they can divide, and the mask density scales the percentage locally
+	# The counts depend on the mask, so each level is kept as its own array and joined at the end instead of sharing one preallocated buffer
+	dtype = ELEMENT if tree is None else TREE_ELEMENT
+	level = np.zeros(len(grid), dtype=dtype)
+	for name in ELEMENT.names:
+		level[name] = grid[name]
+	if tree is not None:
+		level['parent'] = -1
+	inside = mask.contains(level['position'])
+	profiler.count("culled (mask)", len(level) - int(inside.sum()))
+	level = level[inside]
+	profiler.lap("mask")
+	settled = []
+	nodes = []
+	for rec in range(levels):
+		rng.shuffle(level)
+		profiler.lap("shuffle")
+		# The position from the end of the shuffled level stands in for a uniform random number: an element divides when it's within its local share of the tail
+		# With a density of 1.0 everywhere this picks exactly the ceil(count × percentage) elements the unmasked division does
+		count = len(level)
+		rank = np.arange(count - 1, -1, -1)
+		divide = rank < percentage * mask.density(level['position']) * count
+		settled.append(level[~divide])
+		parents = level[divide]
+		first = None
+		if tree is not None:
+			first = sum(len(nodes_level) for nodes_level in nodes)
+			nodes.append(parents)
+
+		level = np.empty(len(parents) * len(division), dtype=dtype)
+		_divide(parents, division, rng, scramble, level, first)
+		inside = mask.contains(level['position'])
+		profiler.count("culled (mask)", len(level) - int(inside.sum()))
+		level = level[inside]
+		profiler.lap("division level " + str(rec + 1))
+
+	rng.shuffle(level)
+	settled.append(level)
+	buffer = np.concatenate(settled)
+	profiler.lap("shuffle")
+
+	if tree is not None:
+		_fill_tree(tree, division, nodes, buffer, [len(part) for part in settled])
+	return buffer
+
+###########################################################################
+# Chunked subdivision
+# Arrays too big to hold in memory are divided a slice of the base lattice at a time
+# A single shuffle of each whole level would pick the divided elements uniformly across the lattice, so the number picked from each slice follows a multivariate hypergeometric distribution
+# Drawing those numbers up front (only counts, nothing else) keeps the statistics of the full division and the exact totals the estimate shows, while each slice only needs its own elements
+
+def _split_counts(base, children, splits):
+	# Settled elements at each level for fixed split counts (as division_counts)
+	settled = []
+	level = base
+	for split in splits:
+		settled.append(level - int(split))
+		level = int(split) * children
+	settled.append(level)
+	return tuple(settled)
+
+def chunk_splits(sizes, children, levels, percentage, rng):
+	# Elements divided at each level (rows) from each slice (columns), adding up to the same split counts as the whole lattice
+	splits = np.zeros((levels, len(sizes)), dtype=np.int64)
+	level = np.asarray(sizes, dtype=np.int64)
+	for rec in range(levels):
+		splits[rec] = rng.multivariate_hypergeometric(level, split_count(int(level.sum()), percentage))
+		level = splits[rec] * children
+	return splits
+
+def subdivide_chunks(grid, division, levels, percentage, rng, size, scramble=True, hierarchy=False):
+	# Yields (settled elements, Hierarchy or None) one slice at a time, each slice sized to end up with roughly size elements
+	# A lattice that fits in a single slice is divided exactly as subdivide() divides it (no split counts are drawn)
+	children = len(division)
+	average = sum(division_counts(len(grid), children, levels, percentage)) / float(max(len(grid), 1)) # final elements per base element
+	step = max(1, int(size / average))
+	starts = range(0, len(grid), step)
+	if len(starts) <= 1:
+		tree = Hierarchy() if hierarchy else None
+		yield subdivide(grid, division, levels, percentage, rng, scramble, tree), tree
+		return
+	splits = chunk_splits([min(step, len(grid) - start) for start in starts], children, levels, percentage, rng)
+	for chunk, start in enumerate(starts):
+		tree = Hierarchy() if hierarchy else None
+		yield subdivide(grid[start:start + step], division, levels, percentage, rng, scramble, tree, splits=splits[:, chunk]), tree
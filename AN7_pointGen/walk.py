@@ -0,0 +1,444 @@
+###########################################################################
+# Random walk generator (no Blender imports)
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from . import profiler
+from .points import Points, Settings, normalized_index, random_generator, settings_dict
+from .rotation import euler_quaternion, quaternion_euler, quaternion_normal, track_quaternions
+from .spatial import SpatialHash
+
+# Adaptive walk tuning
+SMOOTHING = 0.05 # weight of the newest point in the running acceptance rate and time per point
+SATURATION = 0.1 # acceptance rate below which the proposals start shrinking towards the minimum radius
+WARMUP = 16 # points placed before the rate floor is checked
+
+class Walk:
+	# Grows a string of non-overlapping spheres, each one touching the previous one
+	# With a region mask (see mask.py), candidates outside it are rejected before the overlap test
+	# With a collider (see collision.py), candidates that pass the overlap test are also checked against scene geometry, the most expensive test last
+	def __init__(self, settings, rng=None, mask=None, collider=None):
+		# Recursion settings
+		self.elements = settings.max_elements # target number of points
+		self.failures = settings.max_failures # maximum number of consecutive failures
+		self.attempts = settings.max_attempts # maximum number of iterations to try and meet the target number of points
+		# Properties settings
+		self.dimensions = True if settings.walk_dimensions == "3D" else False
+		self.directionality = settings.walk_directionality
+		self.direction_vector = tuple(settings.walk_vector)
+		self.rotation = settings.walk_rotation
+		self.output = settings.walk_rotation_output
+		self.rMinimum = settings.radius_min # minimum radius of the generated point
+		self.rMaximum = settings.radius_max # maximum radius of the generated point
+		self.rDecay = settings.radius_decay
+		self.batch = settings.walk_batch # number of candidates proposed and tested together
+		# One random generator per run, so the same seed always gives the same walk
+		self.rng = random_generator(settings.seed) if rng is None else rng
+		self.mask = mask
+		self.collider = collider
+		# Adaptive settings
+		self.adaptive = settings.walk_adaptive
+		self.backtrack = settings.walk_backtrack # failure streak that sends the walk back one point
+		self.min_rate = settings.walk_min_rate # projected points per second below which the walk stops early (0.0 never stops)
+
+		# Walk state
+		self.origin = (0.0, 0.0, 0.0) # position of the first point
+		self.points = []
+		self.grid = SpatialHash(2.0 * max(self.rMinimum, self.rMaximum)) # largest possible distance between two overlapping points
+		self.nearby = None # neighbourhood of the last point, shared by every batch proposed from it
+		self.kept_rotation = np.zeros((0, 3)) # rotations of points loaded from an earlier walk
+		self.kept_chains = None # chain_id and index of points loaded from an earlier multi-chain walk
+		self.count = 0
+		self.failmax = 0 # This is entirely for reporting purposes and is not needed structurally
+		self.iteration = 0
+		self.time = 0.0
+		# Adaptive state
+		self.acceptance = 1.0 # running acceptance rate (points per attempt), only updated when a point is accepted so it's the same for every batch size
+		self.interval = None # running time per accepted point
+		self.accepted = 0.0 # walk time of the last accepted point
+		self.floor = 1 # points the walk can't backtrack over (the first point, or every point loaded from an earlier walk)
+		self.backtracks = 0
+		self.stalled = False # stopped early by the rate floor
+		self.started = 0.0 # wall time the current run started
+
+	def load(self, points):
+		# Continue from an existing walk (positions, scale and rotation), rebuilding the spatial hash from it
+		# The walk may have been made with larger radii than the current settings, so the cells also fit the largest loaded point
+		self.points = np.concatenate((points.positions, points.scale[:, None]), axis=1).astype(np.float64).tolist()
+		if len(self.points):
+			self.grid = SpatialHash(max(self.grid.size, 2.0 * float(points.scale.max())))
+		for point in self.points:
+			self.grid.insert(point)
+		self.kept_rotation = np.array(points.rotation, dtype=np.float64)
+		self.floor = max(len(self.points), 1)
+		if 'chain_id' in points.attributes:
+			self.kept_chains = (np.array(points.attributes['chain_id']), np.array(points.index)) # a multi-chain walk carries on with its last chain
+		return self
+
+	def finished(self):
+		# Stop once the target is met, or we're too tired to continue...
+		return len(self.points) >= self.elements or self.count >= self.failures or self.iteration >= self.attempts or self.stalled
+
+	def clock(self):
+		# Seconds spent walking, across every run() call (so the gaps between the time slices of the modal operator don't count)
+		return self.time + time.time() - self.started
+
+	def streak_limit(self):
+		# Longest failure streak before the walk gives up, or backtracks when it still can
+		if self.adaptive and len(self.points) > self.floor:
+			return min(self.backtrack, self.failures)
+		return self.failures
+
+	def run(self, seconds=None):
+		# Walk until finished, or only for roughly the given number of seconds (the walk can be resumed by calling this again)
+		# Start timer
+		timer = self.started = time.time()
+		checkRate = self.adaptive and self.min_rate > 0.0
+
+		# Loop until we're too tired to continue...
+		while not self.finished() and (seconds is None or time.time() - timer < seconds):
+			if self.batch > 1 and self.count >= 4:
+				self.step_batch() # only worth it once candidates start failing (batches grow with the failure streak)
+			else:
+				self.step()
+			if self.adaptive and self.count >= self.backtrack and len(self.points) > self.floor:
+				self.step_back()
+			if checkRate and len(self.points) >= WARMUP and self.projected_rate() < self.min_rate:
+				self.stalled = True
+				profiler.count("stopped early (rate floor)")
+
+		# One last check, in case the stop cause was maximum failure count and this value wasn't updated in a successful check status
+		self.failmax = max(self.failmax, self.count) # This is entirely for reporting purposes and is not needed structurally
+
+		self.time += time.time() - timer
+		profiler.lap("walk")
+		return self
+
+	def radius_limit(self):
+		# Upper end of the random radius range
+		limit = self.rMaximum
+		if self.rDecay:
+			lerp = len(self.points) / self.elements
+			limit = (self.rMinimum * lerp) + (self.rMaximum * (1.0 - lerp))
+		if self.adaptive:
+			# Near saturation (few attempts succeeding) the proposals shrink towards the minimum radius, which still fits into the remaining gaps
+			limit = self.rMinimum + (limit - self.rMinimum) * min(1.0, self.acceptance / SATURATION)
+		return limit
+
+	def projected_rate(self):
+		# Points per second the walk can be expected to keep placing: from the running time per point, or the time since the last point once that's longer
+		if self.interval is None:
+			return float('inf')
+		return 1.0 / max(self.interval, self.clock() - self.accepted, 1e-9)
+
+	def step_back(self):
+		# Dead end: drop the last point and carry on from the one before it
+		# Repeated dead ends keep unwinding the chain (never past the first point, or the points loaded from an earlier walk)
+		point = self.points.pop()
+		self.grid.remove(point)
+		self.nearby = None
+		self.failmax = max(self.failmax, self.count) # This is entirely for reporting purposes and is not needed structurally
+		self.count = 0
+		self.backtracks += 1
+		profiler.count("backtracked")
+
+	def step(self):
+		# Propose and test a single candidate
+		random = self.rng.random
+		self.iteration += 1
+		self.count += 1
+
+		# Generate random radius
+		radius = self.rMinimum + (self.radius_limit() - self.rMinimum) * random()
+
+		# If this is the first iteration, just add a point at the origin
+		if len(self.points) == 0:
+			origin = self.origin if self.mask is None else self.mask.nearest(self.origin) # moved inside the mask when the origin isn't
+			self.points.append([origin[0], origin[1], origin[2], radius])
+			self.grid.insert(self.points[0])
+			# And quit early (no need to check anything)
+			return
+
+		# The previous point's radius and position are used to offset the current iteration correctly
+		pPrevious = self.points[-1]
+
+		# Generate random vector
+		x = random() * 2.0 - 1.0
+		y = random() * 2.0 - 1.0
+		z = random() * 2.0 - 1.0 if self.dimensions else 0.0
+		# Blend
+		if self.directionality > 0.0:
+			dx, dy, dz = self.direction_vector
+			x += (dx - x) * self.directionality
+			y += (dy - y) * self.directionality
+			z += (dz - z) * self.directionality
+		# Normalise, then scale and offset the random vector using the radius of the previous iteration and the current iteration, along with the previous position
+		length = math.sqrt(x*x + y*y + z*z)
+		scale = (radius + pPrevious[3]) / length if length > 0.0 else 0.0
+
+		# Create point data array
+		point = [x * scale + pPrevious[0], y * scale + pPrevious[1], z * scale + pPrevious[2], radius]
+
+		# Points outside the mask are rejected without any collision test
+		if self.mask is not None and not self.mask.contains(point)[0]:
+			profiler.count("rejected (mask)")
+			return
+
+		# If no collisions are detected (only nearby cells of the spatial hash need to be tested), add the point to the list and reset the failure counter
+		if not self.grid.overlaps(point):
+			if self.collider is not None and self.collider.rejects(point):
+				profiler.count("rejected (collision)")
+				return
+			self.accept(point)
+		else:
+			profiler.count("rejected (overlap)")
+
+	def step_batch(self):
+		# Propose a whole batch of candidates at once and keep the first one (in random draw order) that doesn't overlap anything
+		# The draws are laid out exactly as the single candidate steps consume them, and the generator is rewound past any unused draws, so the walk is identical for every batch size
+		size = min(self.batch, self.count, self.streak_limit() - self.count, self.attempts - self.iteration)
+		components = 3 if self.dimensions else 2
+		bit_generator = self.rng.bit_generator
+		state = bit_generator.state
+		draws = self.rng.random((size, components + 1))
+
+		pPrevious = self.points[-1]
+		radius = self.rMinimum + (self.radius_limit() - self.rMinimum) * draws[:, 0]
+		vec = np.zeros((size, 3))
+		vec[:, :components] = draws[:, 1:] * 2.0 - 1.0
+		if self.directionality > 0.0:
+			vec += (np.array(self.direction_vector) - vec) * self.directionality
+		length = np.sqrt(vec[:, 0]*vec[:, 0] + vec[:, 1]*vec[:, 1] + vec[:, 2]*vec[:, 2])
+		scale = np.divide(radius + pPrevious[3], length, out=np.zeros(size), where=length > 0.0)
+		candidates = vec * scale[:, None] + np.array(pPrevious[:3])
+
+		# Candidates outside the mask are rejected first, and only the rest are tested for collisions
+		tested = np.arange(size) if self.mask is None else np.flatnonzero(self.mask.contains(candidates))
+
+		# Every candidate lies within one cell of the previous point, so its neighbours are all within two cells (reused until a point is accepted)
+		if self.nearby is None:
+			self.nearby = self.grid.nearby(pPrevious, 2)
+		nearby = self.nearby
+		delta = nearby[None, :, :3] - candidates[tested, None, :]
+		distance = np.sqrt(delta[:, :, 0]*delta[:, :, 0] + delta[:, :, 1]*delta[:, :, 1] + delta[:, :, 2]*delta[:, :, 2])
+		free = tested[~(distance < nearby[None, :, 3] + radius[tested, None]).any(axis=1)]
+
+		# Scene geometry queries can't be vectorised, so they only run on the candidates left after the array tests, in draw order, stopping at the first one that passes
+		winner = None
+		collided = 0
+		for candidate in free.tolist():
+			if self.collider is None or not self.collider.rejects((candidates[candidate, 0], candidates[candidate, 1], candidates[candidate, 2], radius[candidate])):
+				winner = candidate
+				break
+			collided += 1
+
+		if winner is None:
+			self.iteration += size
+			self.count += size
+			self.count_rejections(size - len(tested), len(tested) - len(free), collided)
+			return
+
+		masked = winner - int(np.searchsorted(tested, winner)) # rejected candidates in front of the winner that were outside the mask
+		self.count_rejections(masked, winner - masked - collided, collided)
+		self.iteration += winner + 1
+		self.count += winner + 1
+		if hasattr(bit_generator, 'advance'):
+			bit_generator.state = state
+			bit_generator.advance((winner + 1) * (components + 1))
+		self.accept([float(candidates[winner, 0]), float(candidates[winner, 1]), float(candidates[winner, 2]), float(radius[winner])])
+
+	def count_rejections(self, masked, overlapping, collided):
+		# Rejected candidates by cause (the mask and collision counters only show up when those tests are in use)
+		if self.mask is not None:
+			profiler.count("rejected (mask)", masked)
+		profiler.count("rejected (overlap)", overlapping)
+		if self.collider is not None:
+			profiler.count("rejected (collision)", collided)
+
+	def accept(self, point):
+		# Finally, we have a winner!
+		self.points.append(point)
+		self.grid.insert(point)
+		self.nearby = None
+		if self.adaptive:
+			# Running acceptance rate and time per point (count is the number of attempts this point took)
+			now = self.clock()
+			self.acceptance += (1.0 / max(self.count, 1) - self.acceptance) * SMOOTHING
+			if len(self.points) > self.floor:
+				self.interval = now - self.accepted if self.interval is None else self.interval + ((now - self.accepted) - self.interval) * SMOOTHING
+			self.accepted = now
+		# And now some data housekeeping
+		self.failmax = max(self.failmax, self.count) # This is entirely for reporting purposes and is not needed structurally
+		self.count = 0
+
+	def to_points(self):
+		data = np.array(self.points, dtype=np.float64).reshape(-1, 4)
+		positions = data[:, :3]
+		count = len(positions)
+
+		# Point rotations (loaded points keep theirs, unless their aim target has changed)
+		kept = len(self.kept_rotation)
+		if self.rotation == "AHEAD":
+			kept = max(kept - 1, 0) # the old last point now has a point to aim at
+		elif self.rotation == "BEHIND" and kept < 2:
+			kept = 0 # a lone first point aims at the second one
+		rotation = np.zeros((count, 3))
+		rotation[:kept] = self.kept_rotation[:kept]
+
+		if self.rotation in ("AHEAD", "BEHIND") and count > 1:
+			quaternions = aim_quaternions(positions, self.rotation, kept)
+			rotation[kept:] = quaternion_euler(quaternions)
+		else:
+			if self.rotation not in ("AHEAD", "BEHIND"):
+				rotation[kept:] = self.rng.uniform(-math.pi, math.pi, (count - kept, 3))
+			quaternions = None
+		profiler.lap("rotation")
+
+		# Optional rotation attribute geometry nodes can use without converting the Euler angles (the rotation attribute is always written too)
+		attributes = {}
+		if self.output != "EULER":
+			if quaternions is None:
+				quaternions = euler_quaternion(rotation)
+			else:
+				quaternions = np.concatenate((euler_quaternion(rotation[:kept]), quaternions))
+			attributes = rotation_attributes(self.output, quaternions)
+			profiler.lap("rotation output")
+
+		# A multi-chain walk keeps its chain ids and the index of every other chain, while the last chain (the one that grew) is indexed again from 0.0 to 1.0
+		index = None
+		if self.kept_chains is not None:
+			chain_id, index = self.kept_chains
+			chain_id = np.concatenate((chain_id, np.full(count - len(chain_id), chain_id[-1], dtype=chain_id.dtype)))
+			index = np.concatenate((index, np.zeros(count - len(index))))
+			index[chain_id == chain_id[-1]] = normalized_index(int((chain_id == chain_id[-1]).sum()))
+			attributes['chain_id'] = chain_id
+
+		return Points(positions, data[:, 3], rotation, index, attributes)
+
+def aim_quaternions(positions, mode, start=0):
+	# Aim every point from start on at once: along the vector to the next point for AHEAD (the last one has none), or from the previous point for BEHIND (the first one uses the second)
+	delta = np.zeros((len(positions), 3))
+	if mode == "AHEAD":
+		delta[:-1] = positions[1:] - positions[:-1]
+	else:
+		delta[1:] = positions[1:] - positions[:-1]
+		delta[0] = delta[1]
+	return track_quaternions(delta[start:], 'X' if mode == "AHEAD" else '-X')
+
+def rotation_attributes(output, quaternions):
+	# The quaternion or normal attribute for the selected rotation output
+	if output == "QUATERNION":
+		return {'quaternion': quaternions}
+	return {'normal': quaternion_normal(quaternions)}
+
+def generate_walk(settings, rng=None, mask=None, collider=None):
+	if settings.walk_chains > 1:
+		return generate_chains(settings, workers=1, mask=mask, collider=collider)[0] # callers running many jobs (like the command line tool) already use every core
+	return Walk(settings, rng, mask, collider).run().to_points()
+
+###########################################################################
+# Multi-chain walks
+# Independent walks from spread out starting points, run in parallel worker processes and merged afterwards
+
+def chain_origins(settings):
+	# Starting points on a square (2D) or cubic (3D) grid centred on the origin, walk_spacing apart
+	dims = 3 if settings.walk_dimensions == "3D" else 2
+	side = 1
+	while side ** dims < settings.walk_chains:
+		side += 1
+	cells = np.indices((side,) * dims).reshape(dims, -1).T[:settings.walk_chains]
+	origins = np.zeros((settings.walk_chains, 3))
+	origins[:, :dims] = (cells - (side - 1) * 0.5) * settings.walk_spacing
+	return origins
+
+def run_chain(job):
+	# Runs in a worker process: one complete walk, seeded from the seed and the chain number
+	values, chain, origin, mask, collider = job
+	settings = Settings(**values)
+	with profiler.recording() as profile:
+		walk = Walk(settings, random_generator([settings.seed, chain]), mask, collider)
+		walk.origin = tuple(origin)
+		walk.run()
+	# Only the points and statistics are sent back (rotations are worked out in the main process)
+	walk.grid = None
+	walk.nearby = None
+	walk.mask = None
+	walk.collider = None
+	walk.profile = profile
+	return walk
+
+def merge_chains(chains, cell_size, rotation="RANDOM", output="EULER"):
+	# Combine the chains in order, dropping any point that overlaps a point of an earlier chain
+	# Each chain keeps its own normalised index (0.0 to 1.0 along the chain), and chain_id records which chain a point belongs to
+	# Chains aimed along the walk (AHEAD or BEHIND) that lost points are aimed again, so no point faces a neighbour that was dropped
+	grid = SpatialHash(cell_size)
+	kept = []
+	for chain, points in enumerate(chains):
+		data = np.concatenate((points.positions, points.scale[:, None]), axis=1).astype(np.float64).tolist()
+		keep = np.array([chain == 0 or not grid.overlaps(point) for point in data], dtype=bool)
+		for point, keeping in zip(data, keep.tolist()):
+			if keeping:
+				grid.insert(point) # a chain never overlaps itself, so it only needs testing against the earlier chains (and only the points they kept)
+		kept.append(keep)
+
+	count = sum(int(keep.sum()) for keep in kept)
+	profiler.count("dropped (chain overlap)", sum(len(keep) for keep in kept) - count)
+	profiler.lap("chain merge")
+
+	rotations = []
+	attributes = []
+	for points, keep in zip(chains, kept):
+		chain_rotation = points.rotation[keep]
+		chain_attributes = {name: values[keep] for name, values in points.attributes.items()}
+		if rotation in ("AHEAD", "BEHIND") and not keep.all():
+			positions = points.positions[keep].astype(np.float64)
+			quaternions = aim_quaternions(positions, rotation) if len(positions) > 1 else np.tile((1.0, 0.0, 0.0, 0.0), (len(positions), 1))
+			chain_rotation = quaternion_euler(quaternions)
+			if output != "EULER":
+				chain_attributes.update(rotation_attributes(output, quaternions))
+		rotations.append(chain_rotation)
+		attributes.append(chain_attributes)
+	profiler.lap("rotation")
+
+	return Points(
+		np.concatenate([points.positions[keep] for points, keep in zip(chains, kept)]).reshape(count, 3),
+		np.concatenate([points.scale[keep] for points, keep in zip(chains, kept)]),
+		np.concatenate(rotations).reshape(count, 3),
+		np.concatenate([normalized_index(int(keep.sum())) for keep in kept]),
+		dict({name: np.concatenate([chain[name] for chain in attributes]) for name in attributes[0]},
+			chain_id=np.concatenate([np.full(int(keep.sum()), chain, dtype=np.int32) for chain, keep in enumerate(kept)])))
+
+def generate_chains(settings, workers=None, mask=None, collider=None):
+	# Returns (merged Points, finished walks), running the chains in a pool of worker processes (all cores by default, or in this process with one worker)
+	values = settings_dict(settings)
+	jobs = [(values, chain, origin, mask, collider) for chain, origin in enumerate(chain_origins(settings).tolist())]
+	workers = min(workers or os.cpu_count() or 1, len(jobs))
+	if collider is not None:
+		workers = 1 # the collision tree lives in Blender's mathutils, which worker processes can't import, so the chains run one after another here
+	if workers > 1:
+		# Spawned workers start from a clean interpreter, which is the only safe option inside Blender
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+			walks = list(executor.map(run_chain, jobs))
+	else:
+		walks = [run_chain(job) for job in jobs]
+	# The chains ran in parallel, so their own stage times are left out (they would add up to more than the time taken), only their counters are kept
+	profiler.lap("walk chains")
+	for walk in walks:
+		for name in ("rejected (mask)", "rejected (overlap)", "rejected (collision)"):
+			if name in walk.profile.counts:
+				profiler.count(name, walk.profile.counts[name])
+	points = merge_chains([walk.to_points() for walk in walks], 2.0 * max(settings.radius_min, settings.radius_max), settings.walk_rotation, settings.walk_rotation_output)
+	return points, walks
+
+def extend_walk(settings, points, rng=None, mask=None, collider=None):
+	# Keep walking from the last point of an existing walk until it has grown by walk_extend points
+	# The generator is seeded from the seed and the starting size, so every extension step is reproducible too
+	walk = Walk(settings, random_generator([settings.seed, len(points)]) if rng is None else rng, mask, collider).load(points)
+	walk.elements = len(points) + settings.walk_extend
+	return walk
@@ -0,0 +1,5 @@
+# The add-on folder isn't an installed package, so make it importable from the repository root
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
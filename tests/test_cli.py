@@ -0,0 +1,40 @@
+###########################################################################
+# Command line tests (headless, no Blender needed)
+
+import json
+import os
+import subprocess
+import sys
+
+import AN7_pointGen
+from AN7_pointGen import pointcache
+from AN7_pointGen.cli import job_settings, load_jobs
+from AN7_pointGen.points import Settings, settings_dict
+
+def test_jobs_accept_settings_from_a_cache_header(tmp_path):
+	# A full settings dict (as point cache headers store it) includes gen_type and seed, which the job's own type and seed override
+	header = settings_dict(Settings(gen_type='HEX', hex_count=3, seed=9))
+	path = tmp_path / "jobs.json"
+	path.write_text(json.dumps([
+		{'settings': header, 'output': "copy.an7p"},
+		{'type': 'GRID', 'settings': header, 'seed': [1, 2], 'output': "grid_{seed}.an7p"},
+		]))
+	jobs = load_jobs(str(path))
+	settings = [job_settings(job) for job in jobs]
+	assert [(values.gen_type, values.seed) for values in settings] == [('HEX', 9), ('GRID', 1), ('GRID', 2)]
+	assert all(values.hex_count == 3 for values in settings)
+	assert [job['output'] for job in jobs] == ["copy.an7p", "grid_1.an7p", "grid_2.an7p"]
+
+def test_script_file_runs_jobs_in_worker_processes(tmp_path):
+	# The blender -P form runs cli.py as a script file, which spawned workers run again as __mp_main__ (outside the package)
+	path = tmp_path / "jobs.json"
+	path.write_text(json.dumps([
+		{'type': 'GRID', 'seed': [1, 2], 'output': str(tmp_path / "grid_{seed}.an7p")},
+		{'type': 'HEX', 'seed': 3, 'output': str(tmp_path / "hex.an7p")},
+		]))
+	script = os.path.join(os.path.dirname(AN7_pointGen.__file__), "cli.py")
+	result = subprocess.run([sys.executable, script, str(path), "--workers", "2"], cwd=str(tmp_path), capture_output=True, text=True, timeout=120)
+	assert result.returncode == 0, result.stderr
+	for name in ("grid_1.an7p", "grid_2.an7p", "hex.an7p"):
+		points, header = pointcache.load_points(str(tmp_path / name))
+		assert len(points.positions) > 0
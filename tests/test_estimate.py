@@ -0,0 +1,22 @@
+###########################################################################
+# Point count estimate tests (headless, no Blender needed)
+
+import pytest
+
+from AN7_pointGen import estimate
+from AN7_pointGen.generators import generate
+from AN7_pointGen.points import Settings
+
+@pytest.mark.parametrize("gen_type", ['GRID', 'TRI', 'TRIHEX', 'HEX', 'CUBE', 'FCC', 'BCC'])
+@pytest.mark.parametrize("levels, percentage", [(0, 0.5), (2, 0.0), (3, 0.35), (4, 1.0)])
+def test_lattice_estimate_is_exact(gen_type, levels, percentage):
+	settings = Settings(gen_type=gen_type, grid_count_X=5, grid_count_Y=3, grid_count_Z=2, tri_count=5, hex_count=3, division_levels=levels, division_percentage=percentage, seed=2)
+	assert estimate.point_count(settings) == len(generate(settings).positions)
+
+@pytest.mark.parametrize("settings", [
+	Settings(gen_type='POISSON', max_elements=500, seed=2),
+	Settings(gen_type='WALK', max_elements=200, seed=2),
+	Settings(gen_type='WALK', max_elements=50, max_failures=5, seed=2), # gives up long before the limit
+	])
+def test_capped_estimate_is_an_upper_limit(settings):
+	assert 0 < len(generate(settings).positions) <= estimate.point_count(settings)
@@ -0,0 +1,38 @@
+###########################################################################
+# Region mask tests (headless, no Blender needed)
+
+import numpy as np
+
+from AN7_pointGen.mask import MeshMask, mesh_mask
+from AN7_pointGen.points import random_generator
+
+def brute_force_contains(triangles, positions):
+	# Every position tested against every triangle
+	a = triangles[None, :, 0, :2]
+	b = triangles[None, :, 1, :2]
+	c = triangles[None, :, 2, :2]
+	p = positions[:, None, :2]
+	d1 = (b[..., 0] - a[..., 0]) * (p[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (p[..., 0] - a[..., 0])
+	d2 = (c[..., 0] - b[..., 0]) * (p[..., 1] - b[..., 1]) - (c[..., 1] - b[..., 1]) * (p[..., 0] - b[..., 0])
+	d3 = (a[..., 0] - c[..., 0]) * (p[..., 1] - c[..., 1]) - (a[..., 1] - c[..., 1]) * (p[..., 0] - c[..., 0])
+	return (((d1 >= 0.0) & (d2 >= 0.0) & (d3 >= 0.0)) | ((d1 <= 0.0) & (d2 <= 0.0) & (d3 <= 0.0))).any(axis=1)
+
+def test_mesh_mask_with_mixed_triangle_sizes():
+	# Thousands of small triangles and one large quad: the quad goes into a coarse grid instead of being spread over thousands of fine cells
+	rng = random_generator(4)
+	small = rng.uniform(-10.0, 10.0, (2000, 1, 3)) + rng.uniform(-0.05, 0.05, (2000, 3, 3))
+	quad = np.array([[(0.0, 0.0, 0.0), (20.0, 0.0, 0.0), (20.0, 20.0, 0.0)], [(0.0, 0.0, 0.0), (20.0, 20.0, 0.0), (0.0, 20.0, 0.0)]])
+	mask = MeshMask(np.concatenate((small, quad)))
+	assert sum(len(keys) for size, keys, triangles in mask.grids) <= 4 * len(mask.triangles)
+
+	positions = rng.uniform(-12.0, 22.0, (1500, 3))
+	np.testing.assert_array_equal(mask.contains(positions), brute_force_contains(mask.triangles, positions))
+
+def test_mesh_mask_is_only_rebuilt_when_the_mesh_changes():
+	vertices = np.array([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)], dtype=np.float32)
+	triangles = np.array([(0, 1, 2)], dtype=np.int32)
+	mask = mesh_mask("Mask", vertices, triangles)
+	assert mesh_mask("Mask", vertices.copy(), triangles) is mask
+	moved = mesh_mask("Mask", vertices + 1.0, triangles)
+	assert moved is not mask
+	assert moved.contains([(1.2, 1.2, 0.0)])[0] and not moved.contains([(0.2, 0.2, 0.0)])[0]
@@ -0,0 +1,58 @@
+###########################################################################
+# Point cache file tests (headless, no Blender needed)
+
+import numpy as np
+import pytest
+
+from AN7_pointGen import pointcache
+from AN7_pointGen.generators import generate
+from AN7_pointGen.points import Points, Settings, settings_dict
+
+def assert_same_points(loaded, points):
+	for name in ('positions', 'scale', 'index', 'rotation'):
+		np.testing.assert_array_equal(getattr(loaded, name), getattr(points, name))
+	assert sorted(loaded.attributes) == sorted(points.attributes)
+	for name, values in points.attributes.items():
+		assert loaded.attributes[name].dtype == values.dtype
+		np.testing.assert_array_equal(loaded.attributes[name], values)
+
+@pytest.mark.parametrize("settings", [
+	Settings(gen_type='TRIHEX', hex_count=3, division_levels=2, hierarchy=True, seed=4), # int32 level and parent
+	Settings(gen_type='WALK', walk_chains=3, walk_spacing=2.0, max_elements=40, walk_rotation='AHEAD', walk_rotation_output='QUATERNION', seed=4), # int32 chain_id, float32 N×4 quaternion, and an index restarting on every chain
+	Settings(gen_type='WALK', max_elements=40, walk_rotation_output='NORMAL', seed=4), # float32 N×3 normal
+	])
+def test_save_load_round_trip(tmp_path, settings):
+	points = generate(settings)
+	header = {'type': settings.gen_type, 'seed': settings.seed, 'settings': settings_dict(settings)}
+	path = str(tmp_path / "points.an7p")
+	pointcache.save_points(path, points, header)
+	loaded, loaded_header = pointcache.load_points(path)
+	assert_same_points(loaded, points)
+	assert loaded_header['type'] == settings.gen_type and loaded_header['seed'] == settings.seed
+	assert settings_dict(Settings(**loaded_header['settings'])) == settings_dict(settings)
+	assert_same_points(generate(Settings(**loaded_header['settings'])), points) # the header regenerates the same array
+
+def test_empty_round_trip(tmp_path):
+	path = str(tmp_path / "empty.an7p")
+	points = Points(np.zeros((0, 3)), np.zeros(0), np.zeros((0, 3)), attributes={'chain_id': np.zeros(0, dtype=np.int32)})
+	pointcache.save_points(path, points)
+	loaded, header = pointcache.load_points(path)
+	assert header['count'] == 0
+	assert_same_points(loaded, points)
+
+def test_chunked_writer_indexes_the_whole_array(tmp_path):
+	# Chunks written one after another get an index running over the whole array, not restarting for each chunk
+	points = generate(Settings(gen_type='GRID', division_levels=2, seed=1))
+	path = str(tmp_path / "chunks.an7p")
+	with pointcache.CacheWriter(path, len(points)) as writer:
+		for start in range(0, len(points), 100):
+			end = min(start + 100, len(points))
+			writer.write(Points(points.positions[start:end], points.scale[start:end], points.rotation[start:end]))
+	loaded, header = pointcache.load_points(path)
+	assert_same_points(loaded, Points(points.positions, points.scale, points.rotation))
+
+def test_rejects_other_files(tmp_path):
+	path = tmp_path / "other.an7p"
+	path.write_bytes(b'PLY\n' + bytes(60))
+	with pytest.raises(ValueError):
+		pointcache.load_points(str(path))
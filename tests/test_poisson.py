@@ -0,0 +1,38 @@
+###########################################################################
+# Poisson-disc fill tests (headless, no Blender needed)
+
+import numpy as np
+import pytest
+
+from AN7_pointGen.points import Settings, random_generator
+from AN7_pointGen.poisson import generate_poisson
+from AN7_pointGen.spatial import CellHash, SortedGrid
+
+@pytest.mark.parametrize("dimensions", [True, False])
+def test_cell_hash_matches_sorted_grid(dimensions):
+	# Points linked in several batches (including an empty one) find the same overlaps as a grid built over all of them at once
+	rng = random_generator(5)
+	data = np.zeros((3000, 4))
+	data[:, :3] = rng.uniform(-10.0, 10.0, (3000, 3))
+	data[:, 3] = rng.uniform(0.05, 0.2, 3000)
+	queries = np.zeros((4000, 4))
+	queries[:, :3] = rng.uniform(-10.0, 10.0, (4000, 3))
+	queries[:, 3] = rng.uniform(0.05, 0.2, 4000)
+	if not dimensions:
+		data[:, 2] = 0.0
+		queries[:, 2] = 0.0
+	grid = CellHash(data, 0.4, dimensions)
+	for stop in (1, 700, 700, 2000):
+		grid.add(stop)
+	expected = SortedGrid(data[:2000], 0.4, dimensions).overlaps(queries)
+	assert expected.any() and not expected.all()
+	np.testing.assert_array_equal(grid.overlaps(queries), expected)
+
+@pytest.mark.parametrize("dimensions", ["2D", "3D"])
+def test_poisson_fill_has_no_overlaps(dimensions):
+	settings = Settings(gen_type='POISSON', walk_dimensions=dimensions, radius_min=0.05, radius_max=0.2, max_elements=5000, seed=2)
+	points = generate_poisson(settings)
+	assert len(points.positions) == 5000
+	data = np.column_stack((points.positions, points.scale * 0.999)).astype(np.float64) # float32 storage can put touching points a hair inside each other
+	query, other = SortedGrid(data, 0.4, dimensions == "3D").pairs(data)
+	assert np.all(query == other)
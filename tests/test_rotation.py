@@ -0,0 +1,55 @@
+###########################################################################
+# Rotation math tests (headless, no Blender needed)
+# The expected values were recorded from Blender's mathutils: Vector(v).to_track_quat(track, 'Z'), then .to_euler() and the quaternion applied to the X axis
+
+import numpy as np
+import pytest
+
+from AN7_pointGen.rotation import euler_quaternion, quaternion_euler, quaternion_normal, track_quaternions
+
+# (vector, quaternion, Euler, normal) for each tracking axis, including vectors along the axes and the zero vector
+TRACKED = {
+	'X': [
+		((1.0, 2.0, 3.0), (0.760278, 0.235814, -0.381555, 0.469878), (0.0, -0.930274, 1.107149), (0.267261, 0.534522, 0.801784)),
+		((-0.5, 0.1, -2.0), (0.077809, -0.610590, 0.060460, 0.785793), (0.0, 1.321163, 2.944197), (-0.242251, 0.048450, -0.969003)),
+		((0.0, 0.0, 1.0), (0.707107, 0.0, -0.707107, 0.0), (0.0, -1.570796, 0.0), (0.0, 0.0, 1.0)),
+		((0.0, 0.0, -1.0), (0.707107, 0.0, 0.707107, 0.0), (0.0, 1.570796, 0.0), (0.0, 0.0, -1.0)),
+		((-1.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0), (0.0, 0.0, 3.141593), (-1.0, 0.0, 0.0)),
+		((0.3, -0.7, 0.0), (0.834841, 0.0, 0.0, -0.550491), (0.0, 0.0, -1.165905), (0.393919, -0.919145, 0.0)),
+		((0.0, 0.0, 0.0), (1.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)),
+		],
+	'-X': [
+		((1.0, 2.0, 3.0), (0.469877, 0.381555, 0.235814, -0.760278), (0.0, 0.930274, -2.034444), (-0.267261, -0.534523, -0.801784)),
+		((-0.5, 0.1, -2.0), (0.785793, -0.060460, -0.610590, -0.077809), (0.0, -1.321164, -0.197396), (0.242251, -0.048450, 0.969003)),
+		((0.0, 0.0, 1.0), (0.707107, 0.0, 0.707107, 0.0), (0.0, 1.570796, 0.0), (0.0, 0.0, -1.0)),
+		((0.0, 0.0, -1.0), (0.707107, 0.0, -0.707107, 0.0), (0.0, -1.570796, 0.0), (0.0, 0.0, 1.0)),
+		((-1.0, 0.0, 0.0), (1.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)),
+		((0.3, -0.7, 0.0), (0.550491, 0.0, 0.0, 0.834841), (0.0, 0.0, 1.975688), (-0.393919, 0.919145, 0.0)),
+		((0.0, 0.0, 0.0), (1.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)),
+		],
+	}
+
+# (Euler, quaternion) from Euler(e).to_quaternion(), the last one at gimbal lock
+EULERS = [
+	((0.1, 0.2, 0.3), (0.983347, 0.034271, 0.106021, 0.143572)),
+	((-2.0, 1.2, 0.7), (0.255974, -0.757001, 0.048440, 0.599233)),
+	((3.0, -1.5707963, -0.4), (0.189150, 0.681339, -0.189150, 0.681338)),
+	]
+
+@pytest.mark.parametrize("track", ['X', '-X'])
+def test_track_quaternions_match_blender(track):
+	vectors, quaternions, eulers, normals = (np.array(column) for column in zip(*TRACKED[track]))
+	result = track_quaternions(vectors, track)
+	np.testing.assert_allclose(result, quaternions, atol=1e-5)
+	np.testing.assert_allclose(quaternion_euler(result), eulers, atol=1e-5)
+	np.testing.assert_allclose(quaternion_normal(result), normals, atol=1e-5)
+
+def test_euler_quaternions_match_blender():
+	eulers, quaternions = (np.array(column) for column in zip(*EULERS))
+	np.testing.assert_allclose(euler_quaternion(eulers), quaternions, atol=1e-5)
+
+def test_euler_round_trip():
+	# The Euler angles can come back as the other equivalent solution, but always as the same rotation (a quaternion up to its sign)
+	quaternions = euler_quaternion(np.random.default_rng(3).uniform(-np.pi, np.pi, (1000, 3)))
+	result = euler_quaternion(quaternion_euler(quaternions))
+	np.testing.assert_allclose(np.abs((result * quaternions).sum(axis=1)), 1.0, atol=1e-9)
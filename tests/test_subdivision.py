@@ -0,0 +1,68 @@
+###########################################################################
+# Subdivision tests (headless, no Blender needed)
+
+import numpy as np
+import pytest
+
+from AN7_pointGen import pointcache
+from AN7_pointGen.generators import generate, stream_points
+from AN7_pointGen.points import Settings
+from AN7_pointGen.results import ResultCache, cached
+
+def hex_layouts(random_rotation, seeds=20):
+	# Distinct child layouts of a single fully divided hexagon over a range of seeds
+	layouts = set()
+	for seed in range(seeds):
+		points = generate(Settings(gen_type='HEX', hex_count=1, division_levels=1, division_percentage=1.0, random_rotation=random_rotation, seed=seed))
+		layouts.add(tuple(np.round(np.sort(points.positions[:, 1]), 5)))
+	return layouts
+
+def test_hex_division_is_mirrored_with_random_rotation():
+	# Random rotation mirrors each hexagon's three children at random (both orientations show up), which breaks up the repeating three-hexagon patterns
+	assert len(hex_layouts(True)) == 2
+
+def test_hex_division_is_fixed_without_random_rotation():
+	assert len(hex_layouts(False)) == 1
+
+def brute_force_within(points, center, distance):
+	# Every point tested with the same reach the tree uses, without skipping any families
+	delta = points.positions - np.asarray(center, dtype=np.float32)
+	return np.flatnonzero(np.sqrt((delta ** 2).sum(axis=1)) < distance + points.hierarchy.reach * points.scale)
+
+@pytest.mark.parametrize("gen_type", ['GRID', 'TRI', 'TRIHEX', 'HEX', 'FCC'])
+@pytest.mark.parametrize("levels, percentage", [(3, 0.6), (0, 0.6), (3, 0.0)])
+def test_hierarchy_within_matches_brute_force(gen_type, levels, percentage):
+	# Without any divisions (no levels, or nothing picked to divide) the tree has no nodes, and every point is part of the undivided lattice
+	points = generate(Settings(gen_type=gen_type, division_levels=levels, division_percentage=percentage, hierarchy=True, seed=1))
+	assert (len(points.hierarchy.nodes) > 0) == (levels > 0 and percentage > 0.0)
+	for center, distance in (((0.0, 0.0, 0.0), 0.5), ((3.0, -2.0, 0.5), 1.5), ((100.0, 0.0, 0.0), 1.0)):
+		np.testing.assert_array_equal(points.hierarchy.within(center, distance), brute_force_within(points, center, distance))
+
+def test_lattice_index_is_random_within_each_level():
+	# Over 300,000 points (several streaming chunks), still divided a whole level at a time in memory
+	points = generate(Settings(gen_type='GRID', grid_count_X=120, grid_count_Y=120, division_levels=4, division_percentage=0.5, hierarchy=True, seed=3))
+	level = points.attributes['level']
+	assert np.all(np.diff(level) >= 0) # index ordered by level
+	finest = level == level.max()
+	for axis in (0, 1):
+		assert abs(np.corrcoef(points.index[finest], points.positions[finest, axis])[0, 1]) < 0.05
+
+@pytest.mark.parametrize("hierarchy", [False, True])
+def test_streamed_lattice_matches_its_preview(tmp_path, hierarchy):
+	# Streamed lattices are arranged by slice, so the result cache keeps them apart from the in-memory array and generates them as they'll be written
+	settings = Settings(gen_type='GRID', grid_count_X=120, grid_count_Y=120, division_levels=4, division_percentage=0.5, hierarchy=hierarchy, seed=3)
+	cache = ResultCache(1 << 30)
+	points = cached(settings, generate, cache)
+	path = str(tmp_path / "streamed.an7p")
+	assert stream_points(path, settings) == len(points.positions)
+	streamed, header = pointcache.load_points(path)
+	preview = cached(settings, generate, cache, stream=100000)
+	assert preview is not points and cached(settings, generate, cache) is points
+	for name in ('positions', 'scale', 'rotation', 'index'):
+		np.testing.assert_array_equal(getattr(streamed, name), getattr(preview, name))
+	assert sorted(streamed.attributes) == sorted(preview.attributes) == sorted(points.attributes)
+	for name in points.attributes:
+		np.testing.assert_array_equal(streamed.attributes[name], preview.attributes[name])
+	if hierarchy:
+		# The same number of elements settle at each level either way
+		np.testing.assert_array_equal(np.bincount(streamed.attributes['level']), np.bincount(points.attributes['level']))
@@ -0,0 +1,126 @@
+###########################################################################
+# Random walk tests (headless, no Blender needed)
+
+import math
+
+import numpy as np
+import pytest
+
+from AN7_pointGen.points import Points, Settings, random_generator
+from AN7_pointGen.spatial import SortedGrid
+from AN7_pointGen.rotation import quaternion_euler, quaternion_normal
+from AN7_pointGen.walk import Walk, aim_quaternions, extend_walk, merge_chains
+
+def brute_force_walk(settings):
+	# The original walk loop: every candidate is tested against every point placed so far, drawing from the same generator in the same order
+	random = random_generator(settings.seed).random
+	dimensions = settings.walk_dimensions == "3D"
+	points = []
+	decisions = []
+	count = 0
+	iteration = 0
+	while len(points) < settings.max_elements and count < settings.max_failures and iteration < settings.max_attempts:
+		iteration += 1
+		count += 1
+		radius = settings.radius_min + (settings.radius_max - settings.radius_min) * random()
+		if len(points) == 0:
+			points.append([0.0, 0.0, 0.0, radius])
+			continue
+		pPrevious = points[-1]
+		x = random() * 2.0 - 1.0
+		y = random() * 2.0 - 1.0
+		z = random() * 2.0 - 1.0 if dimensions else 0.0
+		if settings.walk_directionality > 0.0:
+			dx, dy, dz = settings.walk_vector
+			x += (dx - x) * settings.walk_directionality
+			y += (dy - y) * settings.walk_directionality
+			z += (dz - z) * settings.walk_directionality
+		length = math.sqrt(x*x + y*y + z*z)
+		scale = (radius + pPrevious[3]) / length if length > 0.0 else 0.0
+		point = [x * scale + pPrevious[0], y * scale + pPrevious[1], z * scale + pPrevious[2], radius]
+		collision = False
+		for p in points:
+			dx = p[0] - point[0]
+			dy = p[1] - point[1]
+			dz = p[2] - point[2]
+			if math.sqrt(dx*dx + dy*dy + dz*dz) < (p[3] + point[3]):
+				collision = True
+				break
+		decisions.append(not collision)
+		if not collision:
+			points.append(point)
+			count = 0
+	return points, decisions, iteration
+
+@pytest.mark.parametrize("dimensions", ["2D", "3D"])
+@pytest.mark.parametrize("batch", [1, 32])
+@pytest.mark.parametrize("seed", [0, 7])
+def test_indexed_walk_matches_brute_force(dimensions, batch, seed):
+	settings = Settings(gen_type='WALK', walk_dimensions=dimensions, walk_batch=batch, seed=seed, max_elements=250, max_failures=400, max_attempts=20000)
+	walk = Walk(settings).run()
+	points, decisions, iteration = brute_force_walk(settings)
+
+	# Same number of candidates drawn, the same ones accepted (and so the same ones rejected), at exactly the same positions
+	assert walk.iteration == iteration
+	assert len(walk.points) == len(points) == 1 + sum(decisions)
+	assert not all(decisions) # the walk has to have rejected candidates for this to mean anything
+	np.testing.assert_allclose(np.array(walk.points), np.array(points), rtol=0.0, atol=1e-12)
+
+@pytest.mark.parametrize("dimensions", ["2D", "3D"])
+@pytest.mark.parametrize("batch", [1, 32])
+def test_indexed_walk_matches_brute_force_with_directionality(dimensions, batch):
+	# The Z part of the direction vector moves even a 2D walk off the plane, so its overlaps can be in the layers above and below (for single candidates and batches alike)
+	settings = Settings(gen_type='WALK', walk_dimensions=dimensions, walk_directionality=0.3, walk_vector=(0.0, 0.2, 1.0), walk_batch=batch, seed=3, max_elements=300)
+	walk = Walk(settings).run()
+	points, decisions, iteration = brute_force_walk(settings)
+	assert walk.iteration == iteration
+	np.testing.assert_allclose(np.array(walk.points), np.array(points), rtol=0.0, atol=1e-12)
+
+def test_merged_chains_only_collide_with_kept_points():
+	# The second chain overlaps the first and is dropped, so the third (which only overlaps the second) is kept
+	chains = [Points([position], [0.5], [(0.0, 0.0, 0.0)]) for position in ((0.0, 0.0, 0.0), (0.8, 0.0, 0.0), (1.6, 0.0, 0.0))]
+	merged = merge_chains(chains, 1.0)
+	assert merged.attributes['chain_id'].tolist() == [0, 2]
+
+@pytest.mark.parametrize("rotation", ["AHEAD", "BEHIND"])
+def test_merged_chains_aim_at_kept_points(rotation):
+	# The chains start close enough to cross, so the later ones lose points, and their survivors are aimed along the chain that's left
+	settings = Settings(gen_type='WALK', walk_rotation=rotation, walk_rotation_output='NORMAL', max_elements=60, seed=5)
+	walks = [Walk(settings, random_generator([settings.seed, chain])) for chain in range(3)]
+	for chain, walk in enumerate(walks):
+		walk.origin = (chain * 2.0, 0.0, 0.0)
+	chains = [walk.run().to_points() for walk in walks]
+	merged = merge_chains(chains, 2.0 * settings.radius_max, rotation, 'NORMAL')
+
+	chain_id = merged.attributes['chain_id']
+	assert len(merged.positions) < sum(len(chain.positions) for chain in chains)
+	np.testing.assert_array_equal(merged.rotation[chain_id == 0], chains[0].rotation) # the first chain never loses points
+	for chain in range(3):
+		positions = merged.positions[chain_id == chain].astype(np.float64)
+		quaternions = aim_quaternions(positions, rotation)
+		np.testing.assert_allclose(merged.rotation[chain_id == chain], quaternion_euler(quaternions), atol=1e-5)
+		np.testing.assert_allclose(merged.attributes['normal'][chain_id == chain], quaternion_normal(quaternions), atol=1e-5)
+
+def test_extended_multi_chain_walk_grows_its_last_chain():
+	settings = Settings(gen_type='WALK', walk_chains=3, max_elements=40, walk_extend=20, seed=2)
+	walks = [Walk(settings, random_generator([settings.seed, chain])) for chain in range(3)]
+	for chain, walk in enumerate(walks):
+		walk.origin = (chain * 20.0, 0.0, 0.0)
+	chains = merge_chains([walk.run().to_points() for walk in walks], 2.0 * settings.radius_max)
+	extended = extend_walk(settings, chains).run().to_points()
+
+	chain_id = extended.attributes['chain_id']
+	assert chain_id[:len(chains)].tolist() == chains.attributes['chain_id'].tolist()
+	assert (chain_id[len(chains):] == 2).all()
+	np.testing.assert_array_equal(extended.index[chain_id < 2], chains.index[chains.attributes['chain_id'] < 2])
+	assert extended.index[chain_id == 2][0] == 0.0 and extended.index[chain_id == 2][-1] == 1.0
+
+def test_extended_walk_with_smaller_radius_has_no_overlaps():
+	# The loaded walk has much bigger points than the new ones, which still have to find them outside their own neighbouring cells
+	source = Walk(Settings(gen_type='WALK', radius_min=0.5, radius_max=1.5, seed=1, max_elements=300)).run().to_points()
+	settings = Settings(gen_type='WALK', radius_min=0.05, radius_max=0.1, seed=1, walk_extend=2000, max_failures=2000)
+	extended = extend_walk(settings, source).run().to_points()
+	assert len(extended.positions) > len(source.positions)
+	data = np.column_stack((extended.positions, extended.scale * 0.9999)).astype(np.float64) # float32 storage can put touching points a hair inside each other
+	query, other = SortedGrid(data, 3.0).pairs(data)
+	assert np.all(query == other)